@@ -1,14 +1,42 @@
 """Main Textual application for acre."""
 
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 from textual.app import App, ComposeResult
 from textual.binding import Binding
+from textual.timer import Timer
 from textual.widgets import Footer, Header
 
-from acre.core.diff_source import get_diff_source
-from acre.core.watcher import DiffWatcher, SessionWatcher
+from acre.core.diff_loader import shutdown_process_pool
+from acre.core.diff_source import DiffSource, diff_source_kwargs, get_diff_source
 from acre.models.diff import DiffSet
 from acre.models.ocr_adapter import AcreSession, get_session_path
 
+if TYPE_CHECKING:
+    from acre.core.watcher import DiffWatcher, SessionWatcher
+
+
+# Diff sources whose diff can change while acre is running (commit and PR
+# diffs are fixed), so they're watched and reloaded
+_LIVE_SOURCE_TYPES = frozenset({"uncommitted", "staged", "branch"})
+
+# Quiet period (seconds) before reloading after watcher events; bursts of
+# writes within the window collapse into a single reload
+SESSION_RELOAD_DELAY = 0.05
+DIFF_RELOAD_DELAY = 0.15
+
+# Delay (seconds) before writing the session after an edit; edits made in
+# quick succession are written together
+SAVE_DELAY = 0.3
+
+# Batching done by watchfiles before events reach Python (milliseconds):
+# changes are grouped until WATCH_STEP_MS passes quietly, for at most
+# WATCH_DEBOUNCE_MS
+WATCH_DEBOUNCE_MS = 200
+WATCH_STEP_MS = 50
+
 
 class AcreApp(App):
     """Agentic Code Review TUI application."""
@@ -32,15 +60,34 @@ class AcreApp(App):
         diff_set: DiffSet,
         session: AcreSession,
         semantic_mode: bool = False,
+        diff_source: DiffSource | None = None,
     ):
         super().__init__()
         self.diff_set = diff_set
         self.session = session
         self.semantic_mode = semantic_mode
-        self._watcher: SessionWatcher | None = None
-        self._diff_watcher: DiffWatcher | None = None
+        self._watcher: "SessionWatcher | None" = None
+        self._diff_watcher: "DiffWatcher | None" = None
+        self._pending_session_reload: Timer | None = None
+        self._pending_diff_reload: Timer | None = None
+        self._pending_save: Timer | None = None
+        self._session_dirty = False
+        self._session_reload_running = False
+        self._diff_dirty = False
+        # Diff source for reloads, created once since it never changes during
+        # the session (reusing the caller's keeps its parsed-file cache warm)
+        if diff_source is None:
+            diff_source = get_diff_source(
+                session.repo_path,
+                **diff_source_kwargs(session.diff_source_type, session.diff_source_ref),
+            )
+        self._diff_source = diff_source
+        # Session file location; repo path, source and format are fixed for the run
+        self._session_path = self._get_session_path()
+        # Paths shown in the file tree, to tell whether a reload changed its shape
+        self._last_file_paths = {f.path for f in diff_set.files}
 
-    def _get_session_path(self):
+    def _get_session_path(self) -> Path:
         """Get the session file path."""
         return get_session_path(
             self.session.repo_path,
@@ -51,20 +98,27 @@ class AcreApp(App):
 
     def on_mount(self) -> None:
         """Called when app is mounted."""
+        # Imported here so watchfiles' native module only loads once the UI runs
+        from acre.core.watcher import DiffWatcher, SessionWatcher
+
         # Start session file watcher
-        session_path = self._get_session_path()
+        session_path = self._session_path
         self._watcher = SessionWatcher(
             session_path=session_path,
             on_change=self._on_session_file_changed,
+            debounce_ms=WATCH_DEBOUNCE_MS,
+            step_ms=WATCH_STEP_MS,
         )
         self._watcher.start()
 
-        # Start diff watcher for live diff sources (not commit or PR)
-        if self.session.diff_source_type not in ("commit", "pr"):
+        # Start diff watcher for live diff sources
+        if self.session.diff_source_type in _LIVE_SOURCE_TYPES:
             self._diff_watcher = DiffWatcher(
                 repo_path=self.session.repo_path,
                 on_change=self._on_diff_changed,
                 session_file=session_path,
+                debounce_ms=WATCH_DEBOUNCE_MS,
+                step_ms=WATCH_STEP_MS,
             )
             self._diff_watcher.start()
 
@@ -80,88 +134,178 @@ class AcreApp(App):
 
     def _on_session_file_changed(self) -> None:
         """Handle external session file changes."""
-        # Schedule the reload - use call_later since we're in an async task, not a thread
-        self.call_later(self._reload_session)
+        # Restart the quiet-period timer so a burst of writes reloads once
+        self._session_dirty = True
+        if self._pending_session_reload is not None:
+            self._pending_session_reload.stop()
+        self._pending_session_reload = self.set_timer(
+            SESSION_RELOAD_DELAY, self._reload_session, name="session-reload"
+        )
 
     def _on_diff_changed(self) -> None:
         """Handle repository file changes - reload the diff."""
-        self.call_later(self._reload_diff_and_refresh)
+        self._diff_dirty = True
+        if self._pending_diff_reload is not None:
+            self._pending_diff_reload.stop()
+        self._pending_diff_reload = self.set_timer(
+            DIFF_RELOAD_DELAY, self._reload_diff_and_refresh, name="diff-reload"
+        )
 
-    def _reload_session(self) -> None:
+    async def _reload_session(self) -> None:
         """Reload the session from disk and refresh the UI.
 
         With OCR's append-only model, we simply reload the entire review
         since get_visible_activities() handles superseded/retracted items.
+        The file is parsed in a worker thread so the UI stays responsive.
         """
-        session_path = self._get_session_path()
+        self._pending_session_reload = None
+        if not self._session_dirty or self._session_reload_running:
+            # A reload in progress picks up the dirty flag when it finishes
+            return
+        self._session_dirty = False
+
+        session_path = self._session_path
         if not session_path.exists():
             return
 
+        # Write out pending edits first; saving merges in the external
+        # changes, so nothing is lost when the review is replaced below
+        if self._pending_save is not None:
+            self._flush_save()
+
+        self._session_reload_running = True
         try:
+            review = self.session.review
+            activity_count = len(review.activities)
+
             # Load the new session state
-            new_session = AcreSession.load(session_path, format=self.session.format)
+            new_session = await asyncio.to_thread(
+                AcreSession.load, session_path, format=self.session.format
+            )
 
-            # Replace the review with the newly loaded one
-            self.session.review = new_session.review
+            if self._pending_save is not None or len(review.activities) != activity_count:
+                # Edited while loading: saving merges the external changes
+                # into our review, which then has everything
+                self._flush_save()
+            else:
+                # Replace the review with the newly loaded one
+                self.session.review = new_session.review
 
             # Reload the diff to pick up any new changes
             self._reload_diff()
 
-            # Refresh the main screen
-            from acre.screens.main import MainScreen
-            main_screen = self.screen
-            if isinstance(main_screen, MainScreen):
-                main_screen.diff_view.diff_set = self.diff_set
-                main_screen.file_list.diff_set = self.diff_set
-                main_screen.diff_view.refresh_current_file()
-                main_screen.file_list._build_tree()
-                main_screen.file_list.root.expand()
-                if main_screen._show_comment_panel:
-                    main_screen.comment_panel.refresh_comments()
+            # Comments show inline in the diff view as well as in the panel
+            self._refresh_main_screen(diff=True, files=True, comments=True)
 
             self.notify("Session reloaded from external changes")
 
         except Exception as e:
             self.notify(f"Failed to reload session: {e}", severity="error")
+        finally:
+            self._session_reload_running = False
+
+        if self._session_dirty and self._pending_session_reload is None:
+            # Changed again while this reload ran
+            self._pending_session_reload = self.set_timer(
+                SESSION_RELOAD_DELAY, self._reload_session, name="session-reload"
+            )
 
     def _reload_diff(self) -> None:
         """Reload the diff from the repository."""
+        # A commit or PR diff never changes, so keep the one already loaded
+        if self._diff_source.source_type not in _LIVE_SOURCE_TYPES:
+            return
         try:
-            source = get_diff_source(
-                repo_path=self.session.repo_path,
-                staged=(self.session.diff_source_type == "staged"),
-                branch=(self.session.diff_source_ref if self.session.diff_source_type == "branch" else None),
-                commit=(self.session.diff_source_ref if self.session.diff_source_type == "commit" else None),
-                pr=(int(self.session.diff_source_ref) if self.session.diff_source_type == "pr" else None),
-            )
-            self.diff_set = source.get_diff()
+            self.diff_set = self._diff_source.get_diff()
         except Exception as e:
             self.notify(f"Failed to reload diff: {e}", severity="warning")
 
     def _reload_diff_and_refresh(self) -> None:
         """Reload the diff and refresh the UI."""
+        self._pending_diff_reload = None
+        if not self._diff_dirty:
+            return
+        self._diff_dirty = False
+
         self._reload_diff()
 
         # Refresh the main screen with new diff
+        self._refresh_main_screen(diff=True, files=True)
+
+        self.notify("Diff reloaded")
+
+    def _refresh_main_screen(
+        self,
+        *,
+        diff: bool = False,
+        files: bool = False,
+        comments: bool = False,
+    ) -> None:
+        """Refresh only the parts of the main screen affected by a reload.
+
+        Args:
+            diff: Redraw the diff view with the current diff set
+            files: Update the file tree
+            comments: Refresh the comment panel, if it is shown
+        """
         from acre.screens.main import MainScreen
         main_screen = self.screen
-        if isinstance(main_screen, MainScreen):
+        if not isinstance(main_screen, MainScreen):
+            return
+
+        if diff:
             main_screen.diff_view.diff_set = self.diff_set
-            main_screen.file_list.diff_set = self.diff_set
             main_screen.diff_view.refresh_current_file()
-            main_screen.file_list._build_tree()
-            main_screen.file_list.root.expand()
+            main_screen.prune_hunk_context_cache()
+        if files:
+            main_screen.file_list.diff_set = self.diff_set
+            self._refresh_file_tree(main_screen.file_list)
+        if comments and main_screen._show_comment_panel:
+            main_screen.comment_panel.refresh_comments()
 
-        self.notify("Diff reloaded")
+    def _refresh_file_tree(self, file_list) -> None:
+        """Update the file tree, rebuilding it only if the set of files changed."""
+        new_paths = {f.path for f in self.diff_set.files}
+        if new_paths != self._last_file_paths:
+            # _build_tree keeps the root and directory expansion state
+            file_list._build_tree()
+        else:
+            # Same files - just update review marks, comment counts and stats
+            file_list.refresh_files(new_paths)
+        self._last_file_paths = new_paths
+
+    def schedule_save(self) -> None:
+        """Save the session shortly, coalescing bursts of edits into one write."""
+        if self._pending_save is not None:
+            self._pending_save.stop()
+        self._pending_save = self.set_timer(SAVE_DELAY, self._flush_save, name="save")
+
+    def _flush_save(self) -> None:
+        """Write a scheduled save now."""
+        if self._pending_save is not None:
+            self._pending_save.stop()
+            self._pending_save = None
+        try:
+            self.save_session()
+        except Exception as e:
+            self.notify(f"Auto-save failed: {e}", severity="warning")
 
     def save_session(self) -> None:
         """Save the session to disk."""
-        session_path = self._get_session_path()
+        if self._pending_save is not None:
+            # Saving now supersedes any scheduled save
+            self._pending_save.stop()
+            self._pending_save = None
+        session_path = self._session_path
         self.session.save(session_path)
         # Mark our save AFTER writing so mtime comparison works
         if self._watcher:
             self._watcher.mark_our_save()
 
+    def write_session_copy(self) -> None:
+        """Write the session's JSON copy if it is large; for after the app exits."""
+        self.session.write_json_copy(self._session_path)
+
     def action_help(self) -> None:
         """Show help screen."""
         from acre.screens.help import HelpScreen
@@ -169,7 +313,14 @@ class AcreApp(App):
 
     def on_unmount(self) -> None:
         """Called when app is unmounted."""
+        for timer in (self._pending_session_reload, self._pending_diff_reload):
+            if timer is not None:
+                timer.stop()
+        if self._pending_save is not None:
+            self._flush_save()
         if self._watcher:
             self._watcher.stop()
         if self._diff_watcher:
             self._diff_watcher.stop()
+        self._diff_source.close()
+        shutdown_process_pool()
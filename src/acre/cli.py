@@ -4,8 +4,7 @@ from pathlib import Path
 
 import click
 
-from acre.app import AcreApp
-from acre.core.diff_source import get_diff_source
+from acre.core.diff_source import diff_source_kwargs, get_diff_source
 from acre.models.ocr_adapter import AcreSession, get_session_path
 
 
@@ -15,6 +14,10 @@ from acre.models.ocr_adapter import AcreSession, get_session_path
 @click.option("--branch", "-b", help="Review changes from base branch (base...HEAD)")
 @click.option("--commit", "-c", help="Review a specific commit")
 @click.option("--pr", type=int, help="Review a GitHub PR (requires gh CLI)")
+@click.option(
+    "--commits",
+    help="Review several commits: a range (main..HEAD) or a comma-separated list",
+)
 @click.option(
     "--repo",
     "-r",
@@ -36,6 +39,7 @@ def cli(
     branch: str | None,
     commit: str | None,
     pr: int | None,
+    commits: str | None,
     repo: Path,
     semantic: bool,
     new: bool,
@@ -56,39 +60,32 @@ def cli(
         acre --branch main         # Changes vs main branch
         acre --commit abc123       # Specific commit
         acre --pr 42               # GitHub PR #42
+        acre --commits main..HEAD  # Commits on HEAD since main
         acre --new                 # Force new session
         acre --format yaml         # Use YAML format instead of XML
     """
     repo_path = repo.resolve()
 
-    # Determine diff source type and ref
-    if staged:
-        source_type = "staged"
-        source_ref = None
-    elif branch:
-        source_type = "branch"
-        source_ref = branch
-    elif commit:
-        source_type = "commit"
-        source_ref = commit
-    elif pr:
-        source_type = "pr"
-        source_ref = str(pr)
-    else:
-        source_type = "uncommitted"
-        source_ref = None
-
-    # Create diff source
-    source = get_diff_source(
-        repo_path=repo_path,
-        staged=staged,
-        branch=branch,
-        commit=commit,
-        pr=pr,
+    # Determine diff source type and ref: the first flag given wins
+    source_type, source_ref = next(
+        (
+            (name, ref)
+            for name, flag, ref in (
+                ("staged", staged, None),
+                ("branch", branch, branch),
+                ("commit", commit, commit),
+                ("pr", pr, str(pr) if pr else None),
+                ("commits", commits, commits),
+            )
+            if flag
+        ),
+        ("uncommitted", None),
     )
 
-    # Load diff
+    # Create diff source for the same choice, and load the diff (listing a
+    # commit range already runs git)
     try:
+        source = get_diff_source(repo_path, **diff_source_kwargs(source_type, source_ref))
         diff_set = source.get_diff()
     except Exception as e:
         raise click.ClickException(f"Failed to load diff: {e}")
@@ -104,6 +101,9 @@ def cli(
     if session_file.exists() and not new:
         try:
             session = AcreSession.load(session_file, format=format)
+            # The loaded session only knows files it has activity for; add
+            # the rest of the current diff so none go unseen
+            session.add_files(f.path for f in diff_set.files)
             click.echo(f"Resuming session from {session.updated_at.strftime('%Y-%m-%d %H:%M')}")
             click.echo(f"  {session.total_comments} comments, {session.reviewed_count}/{session.total_files} reviewed")
             click.echo(f"  (use --new to start fresh)")
@@ -122,12 +122,20 @@ def cli(
         )
         session.init_files([f.path for f in diff_set.files])
 
-    # Run app
-    app = AcreApp(diff_set=diff_set, session=session, semantic_mode=semantic)
+    # Run app (imported here so early exits don't pay for loading Textual)
+    from acre.app import AcreApp
+    app = AcreApp(
+        diff_set=diff_set,
+        session=session,
+        semantic_mode=semantic,
+        diff_source=source,
+    )
     app.run()
 
     # Always save on exit to ensure correct format
     app.save_session()
+    # Then, with the UI gone, a large session's faster-loading copy
+    app.write_session_copy()
 
 
 if __name__ == "__main__":
@@ -1,22 +1,103 @@
 """Load diffs using the unidiff library."""
 
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
 
 from unidiff import PatchSet
 
-from acre.models.diff import DiffSet
+from acre.models.diff import DiffFile, DiffSet
+
+# Start of each file section in git-style diff output
+_FILE_SECTION_RE = re.compile(r"^diff --git ", re.MULTILINE)
+_FILE_SECTION_RE_BYTES = re.compile(rb"^diff --git ", re.MULTILINE)
+
+# Diffs with at least this many bytes of file sections to parse are split
+# across worker processes; below it, starting them and pickling the results
+# back costs more than parsing here
+_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+_process_pool: ProcessPoolExecutor | None = None
 
 
 def load_diff_from_text(
-    diff_text: str,
+    diff_text: str | bytes,
     description: str,
     base_ref: str | None = None,
     head_ref: str | None = None,
+    file_cache: dict[bytes, list[DiffFile]] | None = None,
 ) -> DiffSet:
     """Parse diff text into a DiffSet.
 
     Args:
-        diff_text: Raw unified diff text
+        diff_text: Raw unified diff text, or UTF-8 bytes as read from git
+        description: Human-readable description of the diff source
+        base_ref: Optional base reference (branch/commit)
+        head_ref: Optional head reference (branch/commit)
+        file_cache: Optional cache of parsed files from a previous call, keyed
+            by a digest of each file's section. Unchanged sections reuse their
+            DiffFile objects; the cache is updated in place.
+
+    Returns:
+        DiffSet containing parsed diff data
+    """
+    if not diff_text or diff_text.isspace():
+        # Nothing to parse - skip building a PatchSet at all
+        return DiffSet(
+            files=[],
+            source_description=description,
+            base_ref=base_ref,
+            head_ref=head_ref,
+        )
+
+    if file_cache is not None:
+        files = _parse_sections_incremental(diff_text, file_cache)
+    elif len(diff_text) >= _PARALLEL_MIN_BYTES:
+        sections = _split_sections(diff_text)
+        if sections is not None:
+            files = [f for parsed in _parse_sections(sections) for f in parsed]
+        else:
+            files = None
+    else:
+        files = None
+    if files is not None:
+        return DiffSet(
+            files=files,
+            source_description=description,
+            base_ref=base_ref,
+            head_ref=head_ref,
+        )
+
+    patch_set = _make_patch_set(diff_text)
+    return DiffSet.from_unidiff(
+        patch_set,
+        description=description,
+        base_ref=base_ref,
+        head_ref=head_ref,
+    )
+
+
+def load_diff_from_stream(
+    lines: Iterable[bytes],
+    description: str,
+    base_ref: str | None = None,
+    head_ref: str | None = None,
+) -> DiffSet:
+    """Parse a diff from an iterable of UTF-8 encoded lines.
+
+    Suitable for reading straight from a subprocess pipe: lines are
+    decoded and parsed as they arrive, so the whole diff is never held
+    in memory as one buffer.
+
+    Args:
+        lines: Diff lines as bytes, including line endings
         description: Human-readable description of the diff source
         base_ref: Optional base reference (branch/commit)
         head_ref: Optional head reference (branch/commit)
@@ -24,7 +105,7 @@ def load_diff_from_text(
     Returns:
         DiffSet containing parsed diff data
     """
-    patch_set = PatchSet(diff_text)
+    patch_set = PatchSet(lines, encoding="utf-8")
     return DiffSet.from_unidiff(
         patch_set,
         description=description,
@@ -33,6 +114,117 @@ def load_diff_from_text(
     )
 
 
+def _make_patch_set(diff_text: str | bytes) -> PatchSet:
+    """Build a PatchSet from diff text or bytes."""
+    if isinstance(diff_text, bytes):
+        # Let unidiff decode line by line as it reads, instead of decoding
+        # the whole buffer into a second copy up front
+        return PatchSet(io.BytesIO(diff_text), encoding="utf-8")
+    return PatchSet(diff_text)
+
+
+def _split_sections(diff_text: str | bytes) -> list[str] | list[bytes] | None:
+    """Split a git diff into its ``diff --git`` file sections.
+
+    Returns None if the text is not split that way.
+    """
+    section_re = _FILE_SECTION_RE_BYTES if isinstance(diff_text, bytes) else _FILE_SECTION_RE
+    starts = [m.start() for m in section_re.finditer(diff_text)]
+    if not starts or diff_text[: starts[0]].strip():
+        return None
+    ends = starts[1:] + [len(diff_text)]
+    return [diff_text[start:end] for start, end in zip(starts, ends)]
+
+
+def _parse_section(section: str | bytes) -> list[DiffFile]:
+    """Parse one file section of a diff."""
+    return [DiffFile.from_unidiff(pf) for pf in _make_patch_set(section)]
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared pool of diff parsing processes, starting it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawned rather than forked: the app runs threads, which a fork
+        # could copy mid-operation. The pool is kept, so this is paid once.
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the diff parsing processes, if they were started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def _parse_sections(sections: list[str] | list[bytes]) -> list[list[DiffFile]]:
+    """Parse diff file sections, across worker processes if they are large.
+
+    Sections are handed over as raw text and parsed entirely in the
+    workers, so no unidiff objects are pickled.
+    """
+    global _process_pool
+    cpus = os.cpu_count() or 1
+    if cpus > 1 and len(sections) > 1 and sum(map(len, sections)) >= _PARALLEL_MIN_BYTES:
+        pool = _get_process_pool()
+        chunksize = max(1, len(sections) // (4 * cpus))
+        try:
+            return list(pool.map(_parse_section, sections, chunksize=chunksize))
+        except (BrokenProcessPool, CancelledError, RuntimeError, OSError):
+            # Workers couldn't be started, died, or were shut down meanwhile;
+            # parse here instead
+            if _process_pool is pool:
+                _process_pool = None
+    return [_parse_section(section) for section in sections]
+
+
+def _parse_sections_incremental(
+    diff_text: str | bytes,
+    file_cache: dict[bytes, list[DiffFile]],
+) -> list[DiffFile] | None:
+    """Parse a git diff one file section at a time, reusing cached sections.
+
+    Returns None if the text is not split into ``diff --git`` sections, in
+    which case the caller parses it as a whole.
+    """
+    sections = _split_sections(diff_text)
+    if sections is None:
+        return None
+
+    is_bytes = isinstance(diff_text, bytes)
+    keys = [
+        hashlib.blake2b(
+            section if is_bytes else section.encode(), digest_size=16
+        ).digest()
+        for section in sections
+    ]
+    seen: dict[bytes, list[DiffFile]] = {}
+    missing: dict[bytes, str | bytes] = {}
+    for key, section in zip(keys, sections):
+        parsed = file_cache.get(key)
+        if parsed is None:
+            missing[key] = section
+        else:
+            seen[key] = parsed
+    # Sections not seen last time are parsed together, so a large diff
+    # can be spread over worker processes
+    seen.update(zip(missing, _parse_sections(list(missing.values()))))
+
+    files: list[DiffFile] = []
+    for key in keys:
+        files.extend(seen[key])
+
+    # Keep only sections from this diff so the cache doesn't grow unbounded
+    file_cache.clear()
+    file_cache.update(seen)
+    return files
+
+
 def load_diff_from_file(
     file_path: Path,
     description: str | None = None,
@@ -48,8 +240,25 @@ def load_diff_from_file(
     Returns:
         DiffSet containing parsed diff data
     """
-    patch_set = PatchSet.from_filename(str(file_path), encoding=encoding)
-    return DiffSet.from_unidiff(
-        patch_set,
-        description=description or file_path.name,
+    stat = file_path.stat()
+    files = _parse_diff_file(str(file_path), stat.st_mtime_ns, stat.st_size, encoding)
+    return DiffSet(
+        files=list(files),
+        source_description=description or file_path.name,
     )
+
+
+@lru_cache(maxsize=8)
+def _parse_diff_file(
+    file_path: str,
+    mtime_ns: int,
+    size: int,
+    encoding: str,
+) -> tuple[DiffFile, ...]:
+    """Parse a diff file, cached by path, modification time and size.
+
+    The mtime and size only take part in the cache key, so a file that has
+    not changed on disk is not parsed again.
+    """
+    patch_set = PatchSet.from_filename(file_path, encoding=encoding)
+    return tuple(DiffFile.from_unidiff(pf) for pf in patch_set)
@@ -1,11 +1,19 @@
 """Diff source implementations."""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, Iterator
+import os
+import stat
 import subprocess
+import tempfile
+import threading
+import weakref
 
-from acre.core.diff_loader import load_diff_from_text
-from acre.models.diff import DiffSet
+from acre.core.diff_loader import load_diff_from_stream, load_diff_from_text
+from acre.models.diff import DiffFile, DiffHunk, DiffLine, DiffSet, LineType
 
 
 class DiffSource(ABC):
@@ -24,84 +32,347 @@ class DiffSource(ABC):
     def source_type(self) -> str:
         """Type identifier for this source."""
 
+    def close(self) -> None:
+        """Release any processes the source keeps running between diffs."""
+
+
+# Thread cap for overlapping git output with untracked file reads; bounded
+# so large untracked trees can't exhaust file descriptors
+_IO_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+
+def _start_git(repo_path: Path, *args: str, text: bool = False) -> subprocess.Popen:
+    """Start a git command in the repository without waiting for it."""
+    return subprocess.Popen(
+        ["git", "-C", str(repo_path), *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=text,
+    )
+
+
+def _finish_git(proc: subprocess.Popen):
+    """Wait for a command from _start_git and return its output.
+
+    Raises CalledProcessError on failure, like subprocess.run(check=True).
+    """
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, stdout, stderr)
+    return stdout
+
+
+def _resolve_commits(repo_path: Path, *revs: str) -> tuple[str, ...]:
+    """Resolve branch names, tags and other revisions to commit SHAs."""
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), "rev-parse", *(f"{rev}^{{commit}}" for rev in revs)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return tuple(result.stdout.split())
+
+
+class _CommitResolver:
+    """Resolves revisions to commit SHAs through one long-running git process.
+
+    ``git cat-file --batch-check`` answers each revision written to it with
+    a line, so repeated diffs don't start a new git process just to resolve
+    their refs. Anything it can't resolve falls back to rev-parse, which
+    raises the usual error. The process is stopped by close(), or when the
+    resolver is garbage collected.
+
+    This is the one git process a diff source keeps running, and only the
+    branch and commit sources have one. It reads object names and types,
+    never blob contents: the working tree sources still run git for each
+    diff, since untracked files aren't in the object database.
+    """
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self._proc: subprocess.Popen | None = None
+        self._finalizer: weakref.finalize | None = None
+        # Diffs may be fetched from worker threads
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the batch process, if it is running."""
+        with self._lock:
+            self._stop()
+
+    def _stop(self) -> None:
+        """Stop the batch process; the caller holds the lock."""
+        self._proc = None
+        if self._finalizer is not None:
+            # Runs _stop_batch_process once, and detaches it from the resolver
+            self._finalizer()
+            self._finalizer = None
+
+    def resolve(self, *revs: str) -> tuple[str, ...]:
+        """Resolve branch names, tags and other revisions to commit SHAs."""
+        if not any("\n" in rev for rev in revs):
+            with self._lock:
+                lines = self._query(revs)
+            if lines is not None:
+                shas = []
+                for line in lines:
+                    # "<sha> commit <size>", or "<rev> missing" and the like
+                    parts = line.split()
+                    if len(parts) != 3 or parts[1] != b"commit":
+                        break
+                    shas.append(parts[0].decode())
+                else:
+                    return tuple(shas)
+        return _resolve_commits(self.repo_path, *revs)
+
+    def _query(self, revs: tuple[str, ...]) -> list[bytes] | None:
+        """Send revisions to the batch process and read one line per revision."""
+        try:
+            proc = self._proc
+            if proc is None or proc.poll() is not None:
+                self._stop()
+                proc = self._proc = subprocess.Popen(
+                    ["git", "-C", str(self.repo_path), "cat-file", "--batch-check"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+                self._finalizer = weakref.finalize(self, _stop_batch_process, proc)
+            proc.stdin.write(b"".join(f"{rev}^{{commit}}\n".encode() for rev in revs))
+            proc.stdin.flush()
+            lines = [proc.stdout.readline() for _ in revs]
+        except OSError:
+            self._stop()
+            return None
+        if not all(lines):
+            # The process went away mid-answer; start a new one next time
+            self._stop()
+            return None
+        return lines
+
+
+def _stop_batch_process(proc: subprocess.Popen) -> None:
+    """Close a git batch process's pipes and wait for it to exit."""
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    proc.stdout.close()
+
+
+@lru_cache(maxsize=8)
+def _git_output_for_commits(repo_path: str, *args: str) -> bytes:
+    """Run git and return its output, cached by arguments.
+
+    Only for commands that name commits by SHA, so the output can never
+    change for the same arguments.
+    """
+    result = subprocess.run(
+        ["git", "-C", repo_path, *args],
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _read_file_bytes(path: str, size: int) -> bytes:
+    """Read a whole file with os.read, given its expected size."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # One byte more than expected shows whether the file has grown
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        # Grew since it was stat'ed; read the rest
+        chunks = [data]
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _parse_status(output: bytes) -> tuple[bool, list[str]]:
+    """Split ``git status --porcelain=v2 -z`` output.
+
+    Returns whether any tracked file has changes, and the untracked paths
+    in the order git listed them.
+    """
+    has_tracked_changes = False
+    untracked_files: list[str] = []
+    records = iter(output.split(b"\0"))
+    for record in records:
+        kind = record[:2]
+        if kind == b"? ":
+            untracked_files.append(os.fsdecode(record[2:]))
+        elif kind in (b"1 ", b"u "):
+            has_tracked_changes = True
+        elif kind == b"2 ":
+            # Renames and copies carry the original path as an extra field
+            has_tracked_changes = True
+            next(records, None)
+    return has_tracked_changes, untracked_files
+
 
 class UncommittedDiffSource(DiffSource):
     """Diff of uncommitted changes (staged + unstaged + untracked)."""
 
     def __init__(self, repo_path: Path):
         self.repo_path = repo_path
+        # Parsed files from the last diff, reused for unchanged sections
+        self._file_cache: dict[bytes, list[DiffFile]] = {}
+        # Untracked files from the last diff: path -> (mtime_ns, size, file)
+        self._untracked_cache: dict[str, tuple[int, int, DiffFile | None]] = {}
 
     def get_diff(self) -> DiffSet:
         """Get diff of all uncommitted changes vs HEAD, including untracked files."""
-        from acre.models.diff import DiffFile, DiffHunk, DiffLine, LineType
-
-        # Get diff of tracked files (staged + unstaged)
-        result = subprocess.run(
-            ["git", "-C", str(self.repo_path), "diff", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=True,
+        # One status call tells us which of the tracked diff and the untracked
+        # listing are needed at all; a clean tree stops here. Optional locks
+        # are off so the status refresh doesn't write the index.
+        status_output = _finish_git(
+            _start_git(
+                self.repo_path,
+                "--no-optional-locks",
+                "status",
+                "--porcelain=v2",
+                "-z",
+                "--untracked-files=all",
+            )
         )
+        has_tracked_changes, untracked_files = _parse_status(status_output)
+        if not has_tracked_changes and not untracked_files:
+            self._file_cache.clear()
+            self._untracked_cache.clear()
+            return DiffSet(files=[], source_description=self.get_description())
+
+        # Tracked files (staged + unstaged) are diffed only if status saw any
+        diff_proc = _start_git(self.repo_path, "diff", "HEAD") if has_tracked_changes else None
+        with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+            # Drain the diff in the background while untracked files are read
+            diff_future = executor.submit(_finish_git, diff_proc) if diff_proc else None
+            untracked_diff_files = self._collect_untracked_files(untracked_files, executor)
+            diff_output = diff_future.result() if diff_future else b""
 
         # Parse tracked files diff
-        diff_set = load_diff_from_text(result.stdout, self.get_description())
-
-        # Get list of untracked files
-        untracked = subprocess.run(
-            ["git", "-C", str(self.repo_path), "ls-files", "--others", "--exclude-standard"],
-            capture_output=True,
-            text=True,
-            check=True,
+        diff_set = load_diff_from_text(
+            diff_output,
+            self.get_description(),
+            file_cache=self._file_cache,
         )
-        untracked_files = [f for f in untracked.stdout.strip().split("\n") if f]
+        diff_set.files.extend(untracked_diff_files)
+        return diff_set
 
-        # Create DiffFile objects for untracked files with status="untracked"
+    def _collect_untracked_files(
+        self,
+        untracked_files: list[str],
+        executor: ThreadPoolExecutor,
+    ) -> list[DiffFile]:
+        """Create DiffFile objects for untracked files with status="untracked".
+
+        Files unchanged since the last call are reused; the rest are read in
+        parallel on the executor.
+        """
+        untracked_cache: dict[str, tuple[int, int, DiffFile | None]] = {}
+        to_read: list[tuple[str, tuple[int, int]]] = []
+        # Plain string paths and os calls: no Path object per file
+        repo_dir = str(self.repo_path)
         for filepath in untracked_files:
-            full_path = self.repo_path / filepath
-            if full_path.is_file():
-                try:
-                    content = full_path.read_text()
-                    file_lines = content.split("\n")
-                    # Remove trailing empty line if file ends with newline
-                    if file_lines and file_lines[-1] == "":
-                        file_lines = file_lines[:-1]
-
-                    # Create diff lines (all additions)
-                    diff_lines = [
-                        DiffLine(
-                            line_type=LineType.ADDITION,
-                            content=line,
-                            old_line_no=None,
-                            new_line_no=i + 1,
-                        )
-                        for i, line in enumerate(file_lines)
-                    ]
-
-                    # Create hunk
-                    hunk = DiffHunk(
-                        old_start=0,
-                        old_count=0,
-                        new_start=1,
-                        new_count=len(file_lines),
-                        header="",
-                        lines=diff_lines,
-                    )
-
-                    # Create DiffFile with untracked status
-                    diff_file = DiffFile(
-                        path=filepath,
-                        old_path=None,
-                        new_path=filepath,
-                        status="untracked",
-                        hunks=[hunk],
-                    )
-                    diff_set.files.append(diff_file)
-
-                except (UnicodeDecodeError, OSError):
-                    # Skip binary or unreadable files
-                    pass
+            try:
+                st = os.stat(os.path.join(repo_dir, filepath))
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+
+            # Only re-read files whose size or mtime changed since last time
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._untracked_cache.get(filepath)
+            if cached is not None and cached[:2] == key:
+                untracked_cache[filepath] = cached
+            else:
+                untracked_cache[filepath] = (*key, None)
+                to_read.append((filepath, key))
+
+        def read(item: tuple[str, tuple[int, int]]) -> DiffFile | None:
+            filepath, (_, size) = item
+            return self._read_untracked_file(filepath, os.path.join(repo_dir, filepath), size)
+
+        # The usual reload has at most one changed file; handing that to a
+        # worker thread costs more than reading it here
+        if len(to_read) > 1:
+            read_files = executor.map(read, to_read)
+        else:
+            read_files = map(read, to_read)
+        for (filepath, key), diff_file in zip(to_read, read_files):
+            untracked_cache[filepath] = (*key, diff_file)
+
+        # Drop files that are no longer untracked
+        self._untracked_cache = untracked_cache
+
+        # Dict order follows untracked_files, so the listing order is kept
+        return [entry[2] for entry in untracked_cache.values() if entry[2] is not None]
+
+    def _read_untracked_file(
+        self,
+        filepath: str,
+        full_path: str,
+        size: int,
+    ) -> DiffFile | None:
+        """Build an all-additions DiffFile for an untracked file.
+
+        ``size`` is the file size from a prior stat, used to read the file
+        in a single call. Returns None for binary or unreadable files.
+        """
+        try:
+            data = _read_file_bytes(full_path, size)
+            content = data.decode()
+        except (UnicodeDecodeError, OSError):
+            # Skip binary or unreadable files
+            return None
+        if "\r" in content:
+            # Match text-mode reading, which translates all line endings
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        file_lines = content.split("\n")
+        # Remove trailing empty line if file ends with newline (in place,
+        # rather than copying the list)
+        if file_lines and file_lines[-1] == "":
+            file_lines.pop()
+
+        # Create diff lines (all additions)
+        diff_lines = [
+            DiffLine(
+                line_type=LineType.ADDITION,
+                content=line,
+                old_line_no=None,
+                new_line_no=i + 1,
+            )
+            for i, line in enumerate(file_lines)
+        ]
+
+        # Create hunk
+        hunk = DiffHunk(
+            old_start=0,
+            old_count=0,
+            new_start=1,
+            new_count=len(file_lines),
+            header="",
+            lines=diff_lines,
+        )
 
-        return diff_set
+        # Create DiffFile with untracked status
+        return DiffFile(
+            path=filepath,
+            old_path=None,
+            new_path=filepath,
+            status="untracked",
+            hunks=[hunk],
+        )
 
     def get_description(self) -> str:
         return "uncommitted changes"
@@ -116,16 +387,21 @@ class StagedDiffSource(DiffSource):
 
     def __init__(self, repo_path: Path):
         self.repo_path = repo_path
+        # Parsed files from the last diff, reused for unchanged sections
+        self._file_cache: dict[bytes, list[DiffFile]] = {}
 
     def get_diff(self) -> DiffSet:
         """Get diff of staged changes."""
         result = subprocess.run(
             ["git", "-C", str(self.repo_path), "diff", "--staged"],
             capture_output=True,
-            text=True,
             check=True,
         )
-        return load_diff_from_text(result.stdout, self.get_description())
+        return load_diff_from_text(
+            result.stdout,
+            self.get_description(),
+            file_cache=self._file_cache,
+        )
 
     def get_description(self) -> str:
         return "staged changes"
@@ -142,26 +418,31 @@ class BranchDiffSource(DiffSource):
         self.repo_path = repo_path
         self.base = base
         self.head = head
+        # Parsed files from the last diff, reused for unchanged sections
+        self._file_cache: dict[bytes, list[DiffFile]] = {}
+        # Merge bases already computed: (base_sha, head_sha) -> merge base SHA
+        self._merge_base_cache: dict[tuple[str, str], str] = {}
+        self._resolver = _CommitResolver(repo_path)
 
     def get_diff(self) -> DiffSet:
         """Get diff between base and head."""
-        result = subprocess.run(
-            [
-                "git",
-                "-C",
-                str(self.repo_path),
-                "diff",
-                f"{self.base}...{self.head}",
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        base_sha, head_sha = self._resolver.resolve(self.base, self.head)
+        # Same as base...head, but the history walk for the merge base is
+        # done once per pair of commits rather than on every diff
+        key = (base_sha, head_sha)
+        merge_base = self._merge_base_cache.get(key)
+        if merge_base is None:
+            merge_base = _finish_git(
+                _start_git(self.repo_path, "merge-base", base_sha, head_sha, text=True)
+            ).strip()
+            self._merge_base_cache[key] = merge_base
+        output = _git_output_for_commits(str(self.repo_path), "diff", merge_base, head_sha)
         return load_diff_from_text(
-            result.stdout,
+            output,
             self.get_description(),
             base_ref=self.base,
             head_ref=self.head,
+            file_cache=self._file_cache,
         )
 
     def get_description(self) -> str:
@@ -171,6 +452,9 @@ class BranchDiffSource(DiffSource):
     def source_type(self) -> str:
         return "branch"
 
+    def close(self) -> None:
+        self._resolver.close()
+
 
 class CommitDiffSource(DiffSource):
     """Diff of a specific commit."""
@@ -178,34 +462,139 @@ class CommitDiffSource(DiffSource):
     def __init__(self, repo_path: Path, commit: str):
         self.repo_path = repo_path
         self.commit = commit
+        self._resolver = _CommitResolver(repo_path)
 
     def get_diff(self) -> DiffSet:
         """Get diff of the specified commit."""
+        (sha,) = self._resolver.resolve(self.commit)
+        output = _git_output_for_commits(str(self.repo_path), "show", sha, "--format=")
+        return load_diff_from_text(
+            output,
+            self.get_description(),
+            head_ref=self.commit,
+        )
+
+    def get_description(self) -> str:
+        return f"commit {self.commit[:7]}"
+
+    @property
+    def source_type(self) -> str:
+        return "commit"
+
+    def close(self) -> None:
+        self._resolver.close()
+
+
+class CommitRangeDiffSource(DiffSource):
+    """Diffs of several commits, fetched in batches rather than one git per commit.
+
+    iter_commit_diffs() is the intended API: it gives each commit's diff on
+    its own, as it arrives. get_diff() only combines commits that touch
+    different files.
+    """
+
+    # Batches start small so the first diffs arrive quickly, then double
+    INITIAL_BATCH_SIZE = 20
+    MAX_BATCH_SIZE = 1000
+
+    def __init__(self, repo_path: Path, commits: list[str], spec: str | None = None):
+        self.repo_path = repo_path
+        # How the commits were asked for (see from_spec), for the description
+        self.spec = spec
+        # git log --no-walk shows each commit once, so repeats are dropped
+        # here too (keeping the first) to keep the order and count honest
+        self.commits = list(dict.fromkeys(commits))
+
+    @classmethod
+    def from_spec(cls, repo_path: Path, spec: str) -> "CommitRangeDiffSource":
+        """Create a source from a revision range (``A..B``) or a comma-separated list.
+
+        A range is listed oldest commit first, like the commits it would
+        apply in order.
+        """
+        if ".." in spec:
+            result = subprocess.run(
+                ["git", "-C", str(repo_path), "rev-list", "--reverse", spec],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            commits = result.stdout.split()
+        else:
+            commits = [commit.strip() for commit in spec.split(",") if commit.strip()]
+        return cls(repo_path, commits, spec)
+
+    def iter_commit_diffs(self) -> Iterator[tuple[str, DiffSet]]:
+        """Yield (sha, diff) for each commit, in the order given, once each.
+
+        Each batch of commits is fetched with a single ``git log --stdin``;
+        batch sizes double as iteration continues, so N commits take about
+        log2(N) git processes.
+        """
+        batch_size = self.INITIAL_BATCH_SIZE
+        start = 0
+        while start < len(self.commits):
+            batch = self.commits[start:start + batch_size]
+            start += len(batch)
+            yield from self._fetch_batch(batch)
+            batch_size = min(batch_size * 2, self.MAX_BATCH_SIZE)
+
+    def _fetch_batch(self, commits: list[str]) -> Iterator[tuple[str, DiffSet]]:
+        """Fetch the diffs of several commits with one git process."""
         result = subprocess.run(
             [
                 "git",
                 "-C",
                 str(self.repo_path),
-                "show",
-                self.commit,
-                "--format=",
+                "log",
+                "--no-walk=unsorted",
+                "--stdin",
+                # Like git show: combined diffs for merges
+                "--cc",
+                # NUL-prefixed SHA marks the start of each commit's diff
+                "--format=%x00%H",
             ],
+            input="\n".join(commits).encode() + b"\n",
             capture_output=True,
-            text=True,
             check=True,
         )
-        return load_diff_from_text(
-            result.stdout,
-            self.get_description(),
-            head_ref=self.commit,
-        )
+        for section in result.stdout.split(b"\0")[1:]:
+            sha, _, diff_output = section.partition(b"\n")
+            sha = sha.decode()
+            yield sha, load_diff_from_text(
+                diff_output,
+                f"commit {sha[:7]}",
+                head_ref=sha,
+            )
+
+    def get_diff(self) -> DiffSet:
+        """Get the diffs of all commits combined, in the order given.
+
+        Raises ValueError if more than one commit changes the same file: their
+        hunks are numbered against different versions of it, so they can't be
+        shown as one file. Use iter_commit_diffs() for those.
+        """
+        files: list[DiffFile] = []
+        changed_by: dict[str, str] = {}
+        for sha, diff_set in self.iter_commit_diffs():
+            for file in diff_set.files:
+                other = changed_by.setdefault(file.path, sha)
+                if other != sha:
+                    raise ValueError(
+                        f"{file.path} is changed by both {other[:7]} and {sha[:7]}; "
+                        "use iter_commit_diffs() for their diffs"
+                    )
+                files.append(file)
+        return DiffSet(files=files, source_description=self.get_description())
 
     def get_description(self) -> str:
-        return f"commit {self.commit[:7]}"
+        if self.spec is not None:
+            return f"commits {self.spec} ({len(self.commits)})"
+        return f"{len(self.commits)} commits"
 
     @property
     def source_type(self) -> str:
-        return "commit"
+        return "commits"
 
 
 class PRDiffSource(DiffSource):
@@ -217,17 +606,26 @@ class PRDiffSource(DiffSource):
 
     def get_diff(self) -> DiffSet:
         """Get diff of the PR using gh CLI."""
-        result = subprocess.run(
-            ["gh", "pr", "diff", str(self.pr_number)],
-            capture_output=True,
-            text=True,
-            cwd=str(self.repo_path),
-            check=True,
-        )
-        return load_diff_from_text(
-            result.stdout,
-            self.get_description(),
-        )
+        # Parse while gh is still downloading rather than buffering it all.
+        # stderr goes to a file so a chatty gh can't block on a full pipe.
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                ["gh", "pr", "diff", str(self.pr_number)],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                cwd=str(self.repo_path),
+            )
+            try:
+                diff_set = load_diff_from_stream(proc.stdout, self.get_description())
+            finally:
+                proc.stdout.close()
+                proc.wait()
+            if proc.returncode:
+                stderr_file.seek(0)
+                raise subprocess.CalledProcessError(
+                    proc.returncode, proc.args, None, stderr_file.read()
+                )
+        return diff_set
 
     def get_description(self) -> str:
         return f"PR #{self.pr_number}"
@@ -243,18 +641,22 @@ def get_diff_source(
     branch: str | None = None,
     commit: str | None = None,
     pr: int | None = None,
+    commits: str | None = None,
 ) -> DiffSource:
     """Factory function to create the appropriate diff source.
 
     Priority:
     1. PR (if specified)
-    2. Commit (if specified)
-    3. Branch (if specified)
-    4. Staged (if flag set)
-    5. Uncommitted (default)
+    2. Commits (range or list, if specified)
+    3. Commit (if specified)
+    4. Branch (if specified)
+    5. Staged (if flag set)
+    6. Uncommitted (default)
     """
     if pr is not None:
         return PRDiffSource(repo_path, pr)
+    elif commits is not None:
+        return CommitRangeDiffSource.from_spec(repo_path, commits)
     elif commit is not None:
         return CommitDiffSource(repo_path, commit)
     elif branch is not None:
@@ -263,3 +665,26 @@ def get_diff_source(
         return StagedDiffSource(repo_path)
     else:
         return UncommittedDiffSource(repo_path)
+
+
+# get_diff_source() keyword for each session source type, and how to build
+# its value from the session's source ref
+_SOURCE_KWARGS: dict[str, tuple[str, Callable[[str | None], Any]]] = {
+    "staged": ("staged", lambda ref: True),
+    "branch": ("branch", str),
+    "commit": ("commit", str),
+    "pr": ("pr", int),
+    "commits": ("commits", str),
+}
+
+
+def diff_source_kwargs(source_type: str, source_ref: str | None) -> dict[str, Any]:
+    """Keyword arguments for get_diff_source() from a source type and ref.
+
+    Uncommitted (or unknown) source types map to no arguments.
+    """
+    entry = _SOURCE_KWARGS.get(source_type)
+    if entry is None:
+        return {}
+    keyword, convert = entry
+    return {keyword: convert(source_ref)}
@@ -1,11 +1,25 @@
 """LLM integration for acre using Claude CLI subprocess."""
 
+import asyncio
+import io
 import json
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
 from dataclasses import dataclass, field
-from typing import Iterator
+from pathlib import Path
+from typing import IO, Iterable, Iterator
 
-from acre.models.diff import DiffFile, DiffHunk
+from acre.models.diff import DiffFile, DiffHunk, LineType
+
+# Unified diff prefix for each line type in analysis context
+_LINE_PREFIX = {
+    LineType.ADDITION: "+",
+    LineType.DELETION: "-",
+    LineType.CONTEXT: " ",
+}
 
 
 @dataclass
@@ -32,173 +46,601 @@ class LLMSession:
         self.messages.append(LLMMessage(role="assistant", content=content))
 
 
+# Claude CLI binaries known to work, as (resolved path, mtime_ns)
+_verified_cli: set[tuple[str, int]] = set()
+
+# Persists the last verified binary across acre runs
+_CLI_CHECK_CACHE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "acre" / "claude_cli.json"
+)
+
+
+def _load_verified_cli() -> tuple[str, int] | None:
+    """Read the last verified Claude CLI binary from the on-disk cache."""
+    try:
+        data = json.loads(_CLI_CHECK_CACHE.read_text())
+        return (data["path"], data["mtime_ns"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_verified_cli(key: tuple[str, int]) -> None:
+    """Record a verified Claude CLI binary; failures are ignored."""
+    try:
+        _CLI_CHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _CLI_CHECK_CACHE.write_text(json.dumps({"path": key[0], "mtime_ns": key[1]}))
+    except OSError:
+        pass
+
+
+# Error for a missing claude binary, whenever it turns out to be missing
+_CLI_NOT_FOUND = "Claude CLI not found. Install with: npm install -g @anthropic-ai/claude-code"
+
+
+def _check_claude_cli() -> None:
+    """Verify claude CLI is available.
+
+    Running ``claude --version`` costs a Node startup, so a successful
+    check is remembered (in this process and on disk) for the binary
+    at its current mtime, and only repeated when the binary changes.
+    """
+    binary = shutil.which("claude")
+    if binary is None:
+        raise RuntimeError(_CLI_NOT_FOUND)
+    key = (os.path.realpath(binary), os.stat(binary).st_mtime_ns)
+    if key in _verified_cli or _load_verified_cli() == key:
+        _verified_cli.add(key)
+        return
+
+    try:
+        result = subprocess.run(
+            [binary, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Claude CLI not working")
+    except FileNotFoundError:
+        raise RuntimeError(_CLI_NOT_FOUND)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Claude CLI timed out")
+
+    _verified_cli.add(key)
+    _save_verified_cli(key)
+
+
+# How many persistent claude processes in a row may exit on their first
+# prompt before streamed prompts stop starting them
+_MAX_WORKER_FAILURES = 3
+
+
 class ClaudeCLIBackend:
     """LLM backend using the Claude CLI (claude command)."""
 
     def __init__(self):
         self._check_claude_cli()
+        # Long-running claude process for streamed prompts (see _stream_response)
+        self._worker: subprocess.Popen | None = None
+        self._worker_supported = True
+        self._worker_turns = 0
+        # Persistent processes in a row that exited on their first prompt
+        self._worker_failures = 0
+        # Prompts stream on a worker thread while the UI may close or
+        # replace the process (new_conversation), so these are locked
+        self._lock = threading.Lock()
+        # Worker whose output a _stream_response() call is reading; only
+        # that call may close its stdout
+        self._reading: subprocess.Popen | None = None
 
     def _check_claude_cli(self) -> None:
         """Verify claude CLI is available."""
-        try:
-            result = subprocess.run(
-                ["claude", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode != 0:
-                raise RuntimeError("Claude CLI not working")
-        except FileNotFoundError:
-            raise RuntimeError(
-                "Claude CLI not found. Install with: npm install -g @anthropic-ai/claude-code"
-            )
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Claude CLI timed out")
+        _check_claude_cli()
 
     def analyze(
         self,
         prompt: str,
-        context: str | None = None,
+        context: str | Iterable[str] | None = None,
         stream: bool = False,
+        followup: bool = False,
     ) -> str | Iterator[str]:
         """Send a prompt to Claude and get a response.
 
+        The prompt is written to claude's stdin rather than passed as an
+        argument, so large contexts aren't limited by argv size and can be
+        streamed without building one big string.
+
         Args:
             prompt: The user's question or request
-            context: Optional context to include (diff, file contents, etc.)
+            context: Optional context to include (diff, file contents, etc.),
+                either a string or chunks from iter_analysis_context()
             stream: If True, return an iterator of chunks
+            followup: If True and streaming, the context is left out when
+                the prompt continues a conversation that already has it
 
         Returns:
             The response text, or an iterator of text chunks if streaming
         """
-        # Build the full prompt with context
-        full_prompt = ""
-        if context:
-            full_prompt = f"{context}\n\n{prompt}"
-        else:
-            full_prompt = prompt
-
         if stream:
-            return self._stream_response(full_prompt)
+            return self._stream_response(prompt, context, followup)
         else:
-            return self._get_response(full_prompt)
+            return self._get_response(_prompt_chunks(prompt, context))
 
-    def _get_response(self, prompt: str) -> str:
+    def _get_response(self, chunks: Iterable[str]) -> str:
         """Get a complete response from Claude."""
-        result = subprocess.run(
-            ["claude", "--print", "--verbose", prompt],
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2 minute timeout
+        # Plain text output: no --verbose diagnostics to receive and strip
+        process, stderr = _start_claude(["--print", "--output-format", "text"], chunks)
+        with stderr:
+            try:
+                stdout, _ = process.communicate(timeout=120)  # 2 minute timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
+
+            if process.returncode != 0:
+                raise RuntimeError(f"Claude CLI error: {_read_stderr(stderr)}")
+
+        return stdout.decode(errors="replace").strip()
+
+    def _ensure_worker(self) -> tuple[subprocess.Popen | None, bool]:
+        """Start the persistent claude process if it isn't running.
+
+        Returns the process and whether this is its first prompt. The
+        process is None if this claude doesn't support reading prompts
+        from stdin, in which case each prompt spawns its own process.
+        """
+        with self._lock:
+            if self._worker is None or self._worker.poll() is not None:
+                if not self._worker_supported:
+                    return None, False
+                old = self._worker
+                if old is not None:
+                    # Exited between prompts; release its pipes
+                    _stop_process(old)
+                    if old is not self._reading:
+                        old.stdout.close()
+                self._worker_turns = 0
+                stderr = tempfile.TemporaryFile()
+                try:
+                    self._worker = subprocess.Popen(
+                        [
+                            "claude",
+                            "--print",
+                            "--verbose",
+                            "--input-format",
+                            "stream-json",
+                            "--output-format",
+                            "stream-json",
+                        ],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=stderr,
+                    )
+                except BaseException as e:
+                    stderr.close()
+                    if isinstance(e, FileNotFoundError):
+                        raise RuntimeError(_CLI_NOT_FOUND) from None
+                    raise
+                # Kept with the process, to show why it exited; closed by
+                # _stop_process()
+                self._worker.stderr = stderr
+            first_turn = self._worker_turns == 0
+            self._worker_turns += 1
+            self._reading = self._worker
+            return self._worker, first_turn
+
+    def new_conversation(self) -> None:
+        """Forget earlier prompts; the next one starts a fresh conversation."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the persistent claude process, if any."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            reading = worker is not None and worker is self._reading
+        _stop_process(worker)
+        if worker is not None and not reading:
+            worker.stdout.close()
+
+    def _discard_worker(self, worker: subprocess.Popen) -> None:
+        """Stop a claude process, if it is still the current worker.
+
+        A worker that was already closed or replaced is left to whoever
+        did that, so a newer process started meanwhile is never killed.
+        """
+        with self._lock:
+            if self._worker is not worker:
+                return
+            self._worker = None
+        _stop_process(worker)
+
+    def _stream_response(
+        self,
+        prompt: str,
+        context: str | Iterable[str] | None,
+        followup: bool = False,
+    ) -> Iterator[str]:
+        """Stream response from Claude using --output-format stream-json.
+
+        Prompts go to a long-running claude process, so only the first one
+        pays for Node startup; follow-ups continue the same conversation
+        until new_conversation(). Falls back to a process per prompt.
+        """
+        worker, first_turn = self._ensure_worker()
+        if worker is None:
+            yield from self._stream_response_oneshot(_prompt_chunks(prompt, context))
+            return
+
+        if followup and not first_turn:
+            # Earlier turns of this conversation already carry the context
+            context = None
+        chunks = _prompt_chunks(prompt, context)
+
+        if first_turn:
+            # Keep the prompt in case this claude turns out not to support
+            # the persistent mode and it has to be sent again
+            chunks = list(chunks)
+        finished = False
+        try:
+            try:
+                # One stream-json user message, with the content JSON-escaped
+                # chunk by chunk instead of encoding the whole prompt at once
+                stdin = worker.stdin
+                stdin.write(b'{"type": "user", "message": {"role": "user", "content": "')
+                for chunk in chunks:
+                    stdin.write(json.dumps(chunk)[1:-1].encode())
+                stdin.write(b'"}}\n')
+                stdin.flush()
+            except (OSError, ValueError):
+                # Already gone, e.g. it rejected the stdin options, or
+                # closed meanwhile
+                pass
+            for event in _iter_events(worker.stdout):
+                if event.get("type") == "result":
+                    finished = True
+                    if event.get("is_error"):
+                        raise RuntimeError(f"Claude CLI error: {event.get('result', '')}")
+                    self._worker_failures = 0
+                    break
+                yield from _event_text(event)
+            else:
+                returncode = worker.wait()
+                finished = True
+                with self._lock:
+                    # Not ours any more: close() or new_conversation() stopped
+                    # it, and the prompt was abandoned along with it
+                    ours = self._worker is worker
+                    if ours:
+                        self._worker = None
+                    # Exited without answering its first prompt: this claude
+                    # may not read prompts from stdin, so answer with a
+                    # process per prompt. The next prompt tries a persistent
+                    # process again, until several in a row have failed.
+                    fall_back = ours and first_turn and returncode != 0
+                    if fall_back:
+                        self._worker_failures += 1
+                        if self._worker_failures >= _MAX_WORKER_FAILURES:
+                            self._worker_supported = False
+                if not ours:
+                    return
+                error = _read_stderr(worker.stderr)
+                _stop_process(worker)
+                if fall_back:
+                    yield from self._stream_response_oneshot(chunks)
+                    return
+                message = "Claude CLI exited unexpectedly"
+                raise RuntimeError(f"{message}: {error}" if error else message)
+        finally:
+            if not finished:
+                # Stopped mid-response (cancelled or failed); the rest of that
+                # response would be read as the next one, so start over
+                self._discard_worker(worker)
+            with self._lock:
+                if self._reading is worker:
+                    self._reading = None
+                current = self._worker is worker
+            if not current:
+                # Stopped for good, here or by close(), which left the pipe
+                # it couldn't close during the read to us
+                worker.stdout.close()
+
+    def _stream_response_oneshot(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Stream response from a claude process started for this prompt."""
+        process, stderr = _start_claude(
+            ["--print", "--verbose", "--output-format", "stream-json"], chunks
         )
+        finished = False
+        with stderr:
+            try:
+                for event in _iter_events(process.stdout):
+                    yield from _event_text(event)
+                finished = True
+            finally:
+                if not finished:
+                    # Cancelled mid-response; don't wait for the rest of it
+                    _stop_process(process)
+                process.wait()
+                process.stdout.close()
+            if process.returncode != 0:
+                raise RuntimeError(f"Claude CLI error: {_read_stderr(stderr)}")
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI error: {result.stderr}")
 
-        return result.stdout.strip()
+class AsyncClaudeCLIBackend:
+    """Asyncio LLM backend using the Claude CLI, for independent prompts.
 
-    def _stream_response(self, prompt: str) -> Iterator[str]:
-        """Stream response from Claude using --output-format stream-json."""
-        process = subprocess.Popen(
-            ["claude", "--print", "--verbose", "--output-format", "stream-json", prompt],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
+    Each prompt runs in its own claude process, so several prompts (e.g.
+    one per hunk) can be answered concurrently without blocking the event
+    loop.
+    """
+
+    def __init__(self, max_concurrent: int = 4):
+        _check_claude_cli()
+        # Bounds the number of claude processes (and their pipes) at once
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def analyze(
+        self,
+        prompt: str,
+        context: str | Iterable[str] | None = None,
+    ) -> str:
+        """Send a prompt to Claude and get the complete response.
+
+        Args:
+            prompt: The user's question or request
+            context: Optional context to include (diff, file contents, etc.),
+                either a string or chunks from iter_analysis_context()
+
+        Returns:
+            The response text
+        """
+        prompt_bytes = "".join(_prompt_chunks(prompt, context)).encode()
+        async with self._semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "claude",
+                    "--print",
+                    "--output-format",
+                    "text",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                # Removed since the check in __init__
+                raise RuntimeError(_CLI_NOT_FOUND) from None
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(prompt_bytes), timeout=120
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                process.kill()
+                await process.wait()
+                raise
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Claude CLI error: {stderr.decode(errors='replace')}")
+
+        return stdout.decode(errors="replace").strip()
+
+    async def analyze_many(
+        self,
+        prompts: Iterable[str | tuple[str, str | Iterable[str] | None]],
+    ) -> list[str]:
+        """Answer several independent prompts concurrently.
+
+        Args:
+            prompts: Prompts, or (prompt, context) pairs
+
+        Returns:
+            The responses, in the same order as the prompts
+        """
+        return await asyncio.gather(
+            *(
+                self.analyze(item) if isinstance(item, str) else self.analyze(*item)
+                for item in prompts
+            )
         )
 
+
+def _iter_events(stream: IO[bytes]) -> Iterator[dict]:
+    """Read stream-json events line by line from a binary pipe.
+
+    Lines are parsed as bytes, which json.loads accepts directly, so no
+    text wrapper decodes them first.
+    """
+    for line in stream:
+        if line.isspace():
+            continue
         try:
-            # Read JSON events line by line
-            for line in process.stdout:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    # Extract text from assistant message events
-                    if event.get("type") == "assistant":
-                        message = event.get("message", {})
-                        for block in message.get("content", []):
-                            if block.get("type") == "text":
-                                yield block.get("text", "")
-                    # Also handle content_block_delta for streaming chunks
-                    elif event.get("type") == "content_block_delta":
-                        delta = event.get("delta", {})
-                        if delta.get("type") == "text_delta":
-                            yield delta.get("text", "")
-                except json.JSONDecodeError:
-                    # Skip malformed lines
-                    continue
-        finally:
+            yield json.loads(line)
+        except ValueError:
+            # Skip malformed lines
+            continue
+
+
+def _event_text(event: dict) -> Iterator[str]:
+    """Yield the response text carried by a stream-json event."""
+    # Extract text from assistant message events
+    if event.get("type") == "assistant":
+        message = event.get("message", {})
+        for block in message.get("content", []):
+            if block.get("type") == "text":
+                yield block.get("text", "")
+    # Also handle content_block_delta for streaming chunks
+    elif event.get("type") == "content_block_delta":
+        delta = event.get("delta", {})
+        if delta.get("type") == "text_delta":
+            yield delta.get("text", "")
+
+
+def _prompt_chunks(prompt: str, context: str | Iterable[str] | None) -> Iterator[str]:
+    """Yield the full prompt: the context, a blank line, then the prompt."""
+    if isinstance(context, str):
+        if context:
+            yield context
+            yield "\n\n"
+    elif context is not None:
+        # Context chunks (from iter_analysis_context) end with a newline
+        yield from context
+        yield "\n"
+    yield prompt
+
+
+def _stop_process(process: subprocess.Popen | None) -> None:
+    """Close a process's stdin, terminate it if still running, and reap it.
+
+    Its stderr, if kept on the process, is closed too.
+    """
+    if process is None:
+        return
+    if process.stdin is not None:
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
             process.wait()
-            if process.returncode != 0:
-                stderr = process.stderr.read()
-                if stderr:
-                    raise RuntimeError(f"Claude CLI error: {stderr}")
+    if process.stderr is not None:
+        process.stderr.close()
 
 
-def build_analysis_context(
+def _start_claude(
+    args: list[str], chunks: Iterable[str]
+) -> tuple[subprocess.Popen, IO[bytes]]:
+    """Start claude for one prompt, fed to its stdin from a thread.
+
+    The prompt is written while the caller reads stdout, and stderr goes
+    to a temporary file, so no pipe can fill up and block the other side
+    however big the prompt is. Returns the process, whose stdin is None,
+    and its stderr file, which the caller closes.
+    """
+    stderr = tempfile.TemporaryFile()
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(
+            ["claude", *args],
+            stdin=read_fd,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+    except BaseException as e:
+        os.close(write_fd)
+        stderr.close()
+        if isinstance(e, FileNotFoundError):
+            raise RuntimeError(_CLI_NOT_FOUND) from None
+        raise
+    finally:
+        os.close(read_fd)
+    threading.Thread(
+        target=_write_chunks,
+        args=(open(write_fd, "wb"), chunks),
+        name="claude-prompt",
+        daemon=True,
+    ).start()
+    return process, stderr
+
+
+def _read_stderr(stderr: IO[bytes]) -> str:
+    """Read back what a process wrote to its stderr file."""
+    stderr.seek(0)
+    return stderr.read().decode(errors="replace").strip()
+
+
+def _write_chunks(stdin: IO[bytes], chunks: Iterable[str]) -> None:
+    """Write text chunks to a process's stdin, then close it."""
+    try:
+        with stdin:
+            for chunk in chunks:
+                stdin.write(chunk.encode())
+    except (OSError, ValueError):
+        # Process exited early; its exit status and stderr tell why
+        pass
+
+
+def iter_analysis_context(
     file: DiffFile,
     hunk: DiffHunk | None = None,
     comments: list[str] | None = None,
-) -> str:
-    """Build context string for LLM analysis.
+) -> Iterator[str]:
+    """Yield the context for LLM analysis in chunks.
+
+    Same text as build_analysis_context(), plus a final newline, produced
+    incrementally so it can be streamed into a prompt.
 
     Args:
         file: The diff file being analyzed
         hunk: Optional specific hunk to focus on
         comments: Optional list of existing comments
-
-    Returns:
-        Formatted context string
     """
-    lines = []
-
     # File info
-    lines.append(f"File: {file.path}")
-    lines.append(f"Status: {file.status}")
-    lines.append(f"Changes: +{file.added_lines} -{file.removed_lines}")
-    lines.append("")
+    yield f"File: {file.path}\n"
+    yield f"Status: {file.status}\n"
+    yield f"Changes: +{file.added_lines} -{file.removed_lines}\n"
+    yield "\n"
 
     # If specific hunk, show just that
     if hunk:
-        lines.append("=== Hunk ===")
-        lines.append(f"@@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@")
+        yield "=== Hunk ===\n"
+        yield f"@@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@\n"
         if hunk.header:
-            lines.append(f"Context: {hunk.header}")
-        lines.append("")
-        for diff_line in hunk.lines:
-            prefix = {
-                "addition": "+",
-                "deletion": "-",
-                "context": " ",
-            }.get(diff_line.line_type.value, " ")
-            lines.append(f"{prefix}{diff_line.content}")
+            yield f"Context: {hunk.header}\n"
+        yield "\n"
+        yield from _iter_hunk_lines(hunk)
     else:
         # Show all hunks
-        lines.append("=== Diff ===")
+        yield "=== Diff ===\n"
         for hunk in file.hunks:
-            lines.append(f"@@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@")
+            yield f"@@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@\n"
             if hunk.header:
-                lines.append(f"  {hunk.header}")
-            for diff_line in hunk.lines:
-                prefix = {
-                    "addition": "+",
-                    "deletion": "-",
-                    "context": " ",
-                }.get(diff_line.line_type.value, " ")
-                lines.append(f"{prefix}{diff_line.content}")
-            lines.append("")
+                yield f"  {hunk.header}\n"
+            yield from _iter_hunk_lines(hunk)
+            yield "\n"
 
     # Existing comments
     if comments:
-        lines.append("")
-        lines.append("=== Existing Review Comments ===")
+        yield "\n"
+        yield "=== Existing Review Comments ===\n"
         for comment in comments:
-            lines.append(f"- {comment}")
+            yield f"- {comment}\n"
+
+
+def _iter_hunk_lines(hunk: DiffHunk) -> Iterator[str]:
+    """Yield a hunk's lines with their diff prefixes, one per line."""
+    for diff_line in hunk.lines:
+        yield _LINE_PREFIX.get(diff_line.line_type, " ")
+        yield diff_line.content
+        yield "\n"
+
+
+def build_analysis_context(
+    file: DiffFile,
+    hunk: DiffHunk | None = None,
+    comments: list[str] | None = None,
+) -> str:
+    """Build context string for LLM analysis.
+
+    Args:
+        file: The diff file being analyzed
+        hunk: Optional specific hunk to focus on
+        comments: Optional list of existing comments
 
-    return "\n".join(lines)
+    Returns:
+        Formatted context string
+    """
+    buf = io.StringIO()
+    w = buf.write
+    for chunk in iter_analysis_context(file, hunk, comments):
+        w(chunk)
+
+    # Every line ends in a newline; drop the last one
+    buf.truncate(buf.tell() - 1)
+    return buf.getvalue()
 
 
 def get_analysis_prompts() -> dict[str, str]:
@@ -5,10 +5,45 @@ like function additions, removals, and modifications.
 """
 
 import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
 
+# Extracted elements per source digest, shared across acre runs
+_AST_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "acre" / "ast"
+)
+
+# Bump when the extracted elements change shape, to ignore old entries
+_AST_CACHE_VERSION = 2
+
+# Sources shorter than this are parsed faster than a cache entry is read
+_AST_CACHE_MIN_SOURCE = 4096
+
+# Entries kept on disk; the least recently used beyond this are removed
+_AST_CACHE_MAX_ENTRIES = 2000
+
+# Whether this process has pruned the cache yet
+_ast_cache_pruned = False
+
+# Element types and language label, shared by every extracted element (and
+# restored to these same objects when read back from the cache)
+_T_FUNC = sys.intern("function")
+_T_AFUNC = sys.intern("async function")
+_T_METHOD = sys.intern("method")
+_T_AMETHOD = sys.intern("async method")
+_T_CLASS = sys.intern("class")
+_LANG_PYTHON = sys.intern("python")
+
 
 class ChangeType(Enum):
     """Type of structural change."""
@@ -19,7 +54,17 @@ class ChangeType(Enum):
     MOVED = "moved"
 
 
-@dataclass
+# Order of change types in summaries, and the marker for each
+_SUMMARY_ORDER = (ChangeType.ADDED, ChangeType.REMOVED, ChangeType.MODIFIED, ChangeType.MOVED)
+_SUMMARY_PREFIX = {
+    ChangeType.ADDED: "+",
+    ChangeType.REMOVED: "-",
+    ChangeType.MODIFIED: "~",
+    ChangeType.MOVED: "→",
+}
+
+
+@dataclass(slots=True)
 class StructuralChange:
     """Represents a structural change in code."""
 
@@ -29,9 +74,14 @@ class StructuralChange:
     old_lineno: int | None = None
     new_lineno: int | None = None
     details: str = ""
+    # Position for ordering changes: the new line, or the old one if removed
+    _sort_key: int = field(default=0, init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self._sort_key = self.new_lineno or self.old_lineno or 0
 
-@dataclass
+
+@dataclass(slots=True)
 class SemanticAnalysis:
     """Result of semantic analysis comparing two code versions."""
 
@@ -53,71 +103,188 @@ class SemanticAnalysis:
         if not self.changes:
             return "No structural changes detected"
 
-        lines = []
-        by_type = {}
-        for change in self.changes:
-            by_type.setdefault(change.change_type, []).append(change)
-
-        if ChangeType.ADDED in by_type:
-            for c in by_type[ChangeType.ADDED]:
-                lines.append(f"+ {c.element_type} {c.name}")
-
-        if ChangeType.REMOVED in by_type:
-            for c in by_type[ChangeType.REMOVED]:
-                lines.append(f"- {c.element_type} {c.name}")
-
-        if ChangeType.MODIFIED in by_type:
-            for c in by_type[ChangeType.MODIFIED]:
-                lines.append(f"~ {c.element_type} {c.name}")
+        # One pass into a bucket per change type, emitted in _SUMMARY_ORDER
+        buckets: dict[ChangeType, list[str]] = {change_type: [] for change_type in _SUMMARY_ORDER}
+        for c in self.changes:
+            buckets[c.change_type].append(f"{_SUMMARY_PREFIX[c.change_type]} {c.element_type} {c.name}")
 
-        if ChangeType.MOVED in by_type:
-            for c in by_type[ChangeType.MOVED]:
-                lines.append(f"→ {c.element_type} {c.name}")
-
-        return "\n".join(lines)
+        return "\n".join(chain.from_iterable(buckets.values()))
 
 
 def _extract_python_elements(source: str) -> dict[str, tuple[str, int, str]]:
     """Extract function and class definitions from Python source.
 
+    Results for larger sources are cached on disk by a digest of the source,
+    so the same content (e.g. the base version of a file) is only parsed once.
+
     Returns:
         Dict mapping name -> (element_type, lineno, signature/base_classes)
     """
-    elements = {}
+    if len(source) < _AST_CACHE_MIN_SOURCE:
+        return _parse_python_elements(source)
+
+    digest = hashlib.blake2b(
+        f"{_AST_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode()
+        + source.encode(errors="surrogatepass"),
+        digest_size=16,
+    ).hexdigest()
+    cache_path = _AST_CACHE_DIR / f"{digest}.json"
+    try:
+        cached = json.loads(cache_path.read_bytes())
+        # Mark as recently used, for pruning
+        os.utime(cache_path)
+        return {
+            name: (sys.intern(element_type), lineno, sig)
+            for name, (element_type, lineno, sig) in cached.items()
+        }
+    except (OSError, ValueError, TypeError, AttributeError):
+        pass
+
+    elements = _parse_python_elements(source)
+    if elements:
+        # Empty results (no definitions, or a failed parse, e.g. a file
+        # mid-edit) aren't worth an entry
+        _write_cache_entry(cache_path, elements)
+    return elements
+
 
+def _write_cache_entry(cache_path: Path, elements: dict[str, tuple[str, int, str]]) -> None:
+    """Atomically write extracted elements to the cache; failures are ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(elements, f)
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    except OSError:
+        return
+
+    global _ast_cache_pruned
+    if not _ast_cache_pruned:
+        _ast_cache_pruned = True
+        _prune_ast_cache(cache_path.parent)
+
+
+def _prune_ast_cache(cache_dir: Path) -> None:
+    """Remove the least recently used cache entries beyond the limit."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+    except OSError:
+        return
+    if len(entries) <= _AST_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[_AST_CACHE_MAX_ENTRIES:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _parse_python_elements(source: str) -> dict[str, tuple[str, int, str]]:
+    """Parse Python source and extract its function and class definitions."""
+    # ast.parse without its wrapper; dont_inherit keeps this module's future
+    # flags out of the parse
     try:
-        tree = ast.parse(source)
-    except SyntaxError:
-        return elements
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
-            # Build function signature
-            args = []
-            for arg in node.args.args:
-                args.append(arg.arg)
-            sig = f"({', '.join(args)})"
-            element_type = "async function" if isinstance(node, ast.AsyncFunctionDef) else "function"
-            elements[node.name] = (element_type, node.lineno, sig)
-
-        elif isinstance(node, ast.ClassDef):
-            # Get base classes
-            bases = [ast.unparse(base) if hasattr(ast, "unparse") else "..." for base in node.bases]
-            base_str = f"({', '.join(bases)})" if bases else ""
-            elements[node.name] = ("class", node.lineno, base_str)
-
-            # Also extract methods
-            for item in node.body:
-                if isinstance(item, ast.FunctionDef | ast.AsyncFunctionDef):
-                    method_name = f"{node.name}.{item.name}"
-                    args = []
-                    for arg in item.args.args:
-                        args.append(arg.arg)
-                    sig = f"({', '.join(args)})"
-                    element_type = "async method" if isinstance(item, ast.AsyncFunctionDef) else "method"
-                    elements[method_name] = (element_type, item.lineno, sig)
+        tree = compile(source, "<diff>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError):
+        # ValueError: source containing null bytes
+        return {}
 
-    return elements
+    extractor = _Extractor()
+    extractor.visit(tree)
+    return extractor.elements
+
+
+def _signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    """Build a function signature from its positional argument names."""
+    return _make_sig(tuple(arg.arg for arg in node.args.args))
+
+
+@lru_cache(maxsize=4096)
+def _make_sig(args: tuple[str, ...]) -> str:
+    """Format a signature, shared between all functions with the same arguments."""
+    return f"({', '.join(args)})"
+
+
+def _base_str(node: ast.expr) -> str:
+    """Render a class base as source, same as ast.unparse.
+
+    Plain and dotted names are joined directly; anything else (e.g.
+    ``Generic[T]``) goes through ast.unparse.
+    """
+    parts = []
+    value = node
+    while isinstance(value, ast.Attribute):
+        parts.append(value.attr)
+        value = value.value
+    if isinstance(value, ast.Name):
+        parts.append(value.id)
+        return ".".join(reversed(parts))
+    return ast.unparse(node)
+
+
+class _Extractor(ast.NodeVisitor):
+    """Collect definitions by visiting statements only.
+
+    Function bodies and expressions are never entered, so the work is
+    proportional to the number of top-level and class-level statements
+    rather than to every node in the tree.
+    """
+
+    def __init__(self):
+        self.elements: dict[str, tuple[str, int, str]] = {}
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self._visit_body(node.body)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.elements[node.name] = (_T_FUNC, node.lineno, _signature(node))
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.elements[node.name] = (_T_AFUNC, node.lineno, _signature(node))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        # Get base classes
+        bases = [_base_str(base) for base in node.bases]
+        base_str = f"({', '.join(bases)})" if bases else ""
+        self.elements[node.name] = (_T_CLASS, node.lineno, base_str)
+
+        # Methods are recorded under the class name; nested classes as usual
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef | ast.AsyncFunctionDef):
+                element_type = _T_AMETHOD if isinstance(item, ast.AsyncFunctionDef) else _T_METHOD
+                self.elements[f"{node.name}.{item.name}"] = (element_type, item.lineno, _signature(item))
+            else:
+                self._visit_body([item])
+
+    def _visit_body(self, statements: list[ast.stmt]) -> None:
+        """Visit definitions, including those under if/try/with/for blocks."""
+        for stmt in statements:
+            if isinstance(stmt, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
+                self.visit(stmt)
+                continue
+            for name in ("body", "orelse", "finalbody"):
+                self._visit_body(getattr(stmt, name, ()))
+            for handler in getattr(stmt, "handlers", ()):
+                self._visit_body(handler.body)
+            for case in getattr(stmt, "cases", ()):
+                self._visit_body(case.body)
+
+
+# Sort key for changes, evaluated in C
+_by_position = attrgetter("_sort_key")
 
 
 def analyze_python_diff(old_source: str, new_source: str) -> SemanticAnalysis:
@@ -130,7 +297,10 @@ def analyze_python_diff(old_source: str, new_source: str) -> SemanticAnalysis:
     Returns:
         SemanticAnalysis with list of structural changes
     """
-    analysis = SemanticAnalysis(language="python")
+    analysis = SemanticAnalysis(language=_LANG_PYTHON)
+    if old_source == new_source:
+        # Nothing can have changed; skip parsing both versions
+        return analysis
 
     try:
         old_elements = _extract_python_elements(old_source)
@@ -140,42 +310,31 @@ def analyze_python_diff(old_source: str, new_source: str) -> SemanticAnalysis:
         analysis.error = str(e)
         return analysis
 
-    old_names = set(old_elements.keys())
-    new_names = set(new_elements.keys())
-
-    # Added elements
-    for name in new_names - old_names:
-        elem_type, lineno, sig = new_elements[name]
-        analysis.changes.append(
-            StructuralChange(
-                change_type=ChangeType.ADDED,
-                element_type=elem_type,
-                name=name,
-                new_lineno=lineno,
-                details=sig,
-            )
-        )
-
-    # Removed elements
-    for name in old_names - new_names:
-        elem_type, lineno, sig = old_elements[name]
-        analysis.changes.append(
-            StructuralChange(
-                change_type=ChangeType.REMOVED,
-                element_type=elem_type,
-                name=name,
-                old_lineno=lineno,
-                details=sig,
+    # One pass over each dict instead of building name sets: every new
+    # element is either added or common, every old one missing from new
+    # is removed
+    added: list[StructuralChange] = []
+    removed: list[StructuralChange] = []
+    modified: list[StructuralChange] = []
+    for name, (new_type, new_lineno, new_sig) in new_elements.items():
+        old = old_elements.get(name)
+        if old is None:
+            # Added elements
+            added.append(
+                StructuralChange(
+                    change_type=ChangeType.ADDED,
+                    element_type=new_type,
+                    name=name,
+                    new_lineno=new_lineno,
+                    details=new_sig,
+                )
             )
-        )
-
-    # Modified elements (same name but different signature or moved)
-    for name in old_names & new_names:
-        old_type, old_lineno, old_sig = old_elements[name]
-        new_type, new_lineno, new_sig = new_elements[name]
+            continue
 
+        # Modified elements (same name but different signature or moved)
+        _, old_lineno, old_sig = old
         if old_sig != new_sig:
-            analysis.changes.append(
+            modified.append(
                 StructuralChange(
                     change_type=ChangeType.MODIFIED,
                     element_type=new_type,
@@ -186,7 +345,7 @@ def analyze_python_diff(old_source: str, new_source: str) -> SemanticAnalysis:
                 )
             )
         elif abs(old_lineno - new_lineno) > 5:  # Significant move
-            analysis.changes.append(
+            modified.append(
                 StructuralChange(
                     change_type=ChangeType.MOVED,
                     element_type=new_type,
@@ -197,36 +356,60 @@ def analyze_python_diff(old_source: str, new_source: str) -> SemanticAnalysis:
                 )
             )
 
+    # Removed elements
+    if len(old_elements) > len(new_elements) - len(added):
+        for name, (elem_type, lineno, sig) in old_elements.items():
+            if name not in new_elements:
+                removed.append(
+                    StructuralChange(
+                        change_type=ChangeType.REMOVED,
+                        element_type=elem_type,
+                        name=name,
+                        old_lineno=lineno,
+                        details=sig,
+                    )
+                )
+
+    analysis.changes = added + removed + modified
+
     # Sort by new line number (or old if removed)
-    analysis.changes.sort(key=lambda c: c.new_lineno or c.old_lineno or 0)
+    analysis.changes.sort(key=_by_position)
 
     return analysis
 
 
+# Language for each recognized file extension
+_LANGUAGE_MAP = {
+    ".py": _LANG_PYTHON,
+    ".pyi": _LANG_PYTHON,
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "javascript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+}
+
+
 def detect_language(file_path: str) -> str | None:
     """Detect programming language from file extension.
 
     Returns:
         Language name or None if not recognized
     """
-    suffix = Path(file_path).suffix.lower()
-    language_map = {
-        ".py": "python",
-        ".pyi": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".jsx": "javascript",
-        ".tsx": "typescript",
-        ".java": "java",
-        ".go": "go",
-        ".rs": "rust",
-        ".rb": "ruby",
-        ".c": "c",
-        ".cpp": "cpp",
-        ".h": "c",
-        ".hpp": "cpp",
-    }
-    return language_map.get(suffix)
+    # Suffix of the last path component, as Path.suffix would give it,
+    # without building a Path
+    name = file_path[file_path.rfind("/") + 1 :]
+    dot = name.rfind(".")
+    if dot <= 0:
+        return None
+    return _LANGUAGE_MAP.get(name[dot:].lower())
 
 
 def analyze_file_diff(
@@ -248,7 +431,7 @@ def analyze_file_diff(
     """
     language = detect_language(file_path)
 
-    if language == "python":
+    if language == _LANG_PYTHON:
         return analyze_python_diff(old_content, new_content)
     elif language:
         return SemanticAnalysis(
@@ -264,6 +447,11 @@ def analyze_file_diff(
         )
 
 
+def _content_digest(content: str) -> bytes:
+    """Digest of file content, for cache keys that must not collide."""
+    return hashlib.blake2b(content.encode(errors="surrogatepass"), digest_size=16).digest()
+
+
 class SemanticDiffProvider:
     """Provides semantic diff analysis for diff files.
 
@@ -271,14 +459,17 @@ class SemanticDiffProvider:
     structural change information.
     """
 
-    def __init__(self, repo_path: Path | None = None):
+    def __init__(self, repo_path: Path | None = None, max_cache_size: int = 256):
         """Initialize the provider.
 
         Args:
             repo_path: Optional path to repository for fetching file contents
+            max_cache_size: Number of analyses to keep, least recently used
+                dropped first
         """
         self.repo_path = repo_path
-        self._cache: dict[str, SemanticAnalysis] = {}
+        self._max_cache_size = max_cache_size
+        self._cache: OrderedDict[tuple[str, bytes, bytes], SemanticAnalysis] = OrderedDict()
 
     def analyze(
         self,
@@ -288,13 +479,19 @@ class SemanticDiffProvider:
     ) -> SemanticAnalysis:
         """Analyze a file's structural changes.
 
-        Results are cached by file path.
+        Results are cached by file path and a digest of each content, so an
+        entry goes stale as soon as the file changes.
         """
-        if file_path in self._cache:
-            return self._cache[file_path]
+        key = (file_path, _content_digest(old_content), _content_digest(new_content))
+        analysis = self._cache.get(key)
+        if analysis is not None:
+            self._cache.move_to_end(key)
+            return analysis
 
         analysis = analyze_file_diff(file_path, old_content, new_content)
-        self._cache[file_path] = analysis
+        self._cache[key] = analysis
+        if len(self._cache) > self._max_cache_size:
+            self._cache.popitem(last=False)
         return analysis
 
     def clear_cache(self) -> None:
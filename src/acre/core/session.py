@@ -1,42 +1,27 @@
 """Session persistence for acre review sessions."""
 
 import json
-import subprocess
+import os
 from datetime import datetime
 from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Literal
 
-import yaml
-
 from acre.models.comment import Comment, CommentCategory
+from acre.models.ocr_adapter import read_git_user
 from acre.models.review import FileReviewState, ResolvedHunk, ReviewSession
 
 
-@lru_cache(maxsize=1)
 def get_git_user() -> str:
     """Get git user as 'Name <email>' format.
 
     Returns 'human' as fallback if git config is not available.
     """
-    try:
-        name = subprocess.run(
-            ["git", "config", "user.name"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        ).stdout.strip()
-        email = subprocess.run(
-            ["git", "config", "user.email"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        ).stdout.strip()
-        if name and email:
-            return f"{name} <{email}>"
-        return name or email or "human"
-    except Exception:
-        return "human"
+    name, email = read_git_user()
+    if name and email:
+        return f"{name} <{email}>"
+    return name or email or "human"
 
 
 # Custom string class to force literal block style in YAML
@@ -45,25 +30,34 @@ class LiteralStr(str):
     pass
 
 
-class LiteralDumper(yaml.SafeDumper):
-    """YAML Dumper that uses literal block style for LiteralStr and multiline strings."""
-    pass
-
-
 def _str_representer(dumper, data):
     """Use literal block style for LiteralStr and multiline strings."""
-    # Check for LiteralStr first (it's a str subclass)
+    # Check for LiteralStr first (it's a str subclass); pass it on as a
+    # plain str, since the C emitter rejects str subclasses
     if isinstance(data, LiteralStr):
-        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+        return dumper.represent_scalar("tag:yaml.org,2002:str", str(data), style="|")
     # Use literal style for any multiline string
     if "\n" in data:
         return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
     return dumper.represent_scalar("tag:yaml.org,2002:str", data)
 
 
-# Register for both str and LiteralStr to ensure proper dispatch
-LiteralDumper.add_representer(str, _str_representer)
-LiteralDumper.add_representer(LiteralStr, _str_representer)
+@lru_cache(maxsize=1)
+def _get_dumper() -> type:
+    """YAML Dumper that uses literal block style for LiteralStr and multiline strings.
+
+    Built on first use so yaml is only imported when a session is written.
+    """
+    import yaml
+
+    # libyaml's C emitter when PyYAML was built with it, else the pure-Python one
+    class LiteralDumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+        pass
+
+    # Register for both str and LiteralStr to ensure proper dispatch
+    LiteralDumper.add_representer(str, _str_representer)
+    LiteralDumper.add_representer(LiteralStr, _str_representer)
+    return LiteralDumper
 
 
 # LLM instructions that appear in the first YAML document
@@ -195,6 +189,36 @@ def get_session_path(session: ReviewSession) -> Path:
     return session.repo_path / f"{base}{suffix}.yaml"
 
 
+# Comment attributes in the order they're written, fetched in one call
+_COMMENT_FIELDS = (
+    "id",
+    "author",
+    "category",
+    "content",
+    "file_path",
+    "line_no",
+    "line_no_end",
+    "is_deleted_line",
+    "created_at",
+    "updated_at",
+    "context",
+    "llm_response",
+    "llm_session_id",
+)
+_comment_values = attrgetter(*_COMMENT_FIELDS)
+
+
+def _comment_to_dict(comment: Comment) -> dict:
+    """Convert a comment to a serializable dict."""
+    data = dict(zip(_COMMENT_FIELDS, _comment_values(comment)))
+    data["category"] = data["category"].value
+    data["created_at"] = data["created_at"].isoformat()
+    data["updated_at"] = data["updated_at"].isoformat()
+    for key in ("context", "llm_response"):
+        data[key] = LiteralStr(data[key]) if data[key] else None
+    return data
+
+
 def session_to_dict(session: ReviewSession) -> dict:
     """Convert a session to a serializable dict.
 
@@ -214,24 +238,7 @@ def session_to_dict(session: ReviewSession) -> dict:
             path: {
                 "file_path": state.file_path,
                 "reviewed": state.reviewed,
-                "comments": [
-                    {
-                        "id": c.id,
-                        "author": c.author,
-                        "category": c.category.value,
-                        "content": c.content,
-                        "file_path": c.file_path,
-                        "line_no": c.line_no,
-                        "line_no_end": c.line_no_end,
-                        "is_deleted_line": c.is_deleted_line,
-                        "created_at": c.created_at.isoformat(),
-                        "updated_at": c.updated_at.isoformat(),
-                        "context": LiteralStr(c.context) if c.context else None,
-                        "llm_response": LiteralStr(c.llm_response) if c.llm_response else None,
-                        "llm_session_id": c.llm_session_id,
-                    }
-                    for c in state.comments
-                ],
+                "comments": [_comment_to_dict(c) for c in state.comments],
                 "resolved_hunks": [
                     {
                         "hunk_id": rh.hunk_id,
@@ -253,6 +260,11 @@ def session_to_dict(session: ReviewSession) -> dict:
     }
 
 
+# Timestamps repeat a lot (edits saved together share one), and datetimes are
+# immutable, so parsed values can be shared
+_parse_datetime = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+
 def session_from_dict(data: dict, repo_path: Path) -> ReviewSession:
     """Restore a session from a dict.
 
@@ -272,19 +284,21 @@ def session_from_dict(data: dict, repo_path: Path) -> ReviewSession:
         scroll_position=data.get("scroll_position", 0),
     )
 
+    # Default for timestamps an LLM omitted, shared by everything loaded here
+    now = datetime.now()
+
     # Restore files
     for path, file_data in data.get("files", {}).items():
         comments = []
         for c_data in file_data.get("comments", []):
             # Handle optional fields that LLM may omit (per instructions)
-            now = datetime.now()
             created_at = (
-                datetime.fromisoformat(c_data["created_at"])
+                _parse_datetime(c_data["created_at"])
                 if c_data.get("created_at")
                 else now
             )
             updated_at = (
-                datetime.fromisoformat(c_data["updated_at"])
+                _parse_datetime(c_data["updated_at"])
                 if c_data.get("updated_at")
                 else created_at
             )
@@ -314,9 +328,9 @@ def session_from_dict(data: dict, repo_path: Path) -> ReviewSession:
         resolved_hunks = []
         for rh_data in file_data.get("resolved_hunks", []):
             resolved_at = (
-                datetime.fromisoformat(rh_data["resolved_at"])
+                _parse_datetime(rh_data["resolved_at"])
                 if rh_data.get("resolved_at")
-                else datetime.now()
+                else now
             )
             resolved_hunks.append(
                 ResolvedHunk(
@@ -368,7 +382,10 @@ def session_to_yaml(session: ReviewSession, diff_context: str = "") -> str:
     # Document 2: Session data
     doc2 = session_to_dict(session)
 
+    import yaml
+
     # Serialize as multi-document YAML with literal block style for multiline strings
+    LiteralDumper = _get_dumper()
     yaml_output = yaml.dump(doc1, Dumper=LiteralDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
     yaml_output += "\n---\n"
     yaml_output += yaml.dump(doc2, Dumper=LiteralDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
@@ -386,7 +403,21 @@ def session_from_yaml(yaml_content: str, repo_path: Path) -> ReviewSession:
     Returns:
         The parsed session
     """
-    docs = list(yaml.safe_load_all(yaml_content))
+    import yaml
+
+    # libyaml's C parser when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    # The instructions document (with the possibly large diff context) is
+    # never used, so when the session follows a bare '---' line as written
+    # by session_to_yaml, only the session document is parsed
+    _, separator, session_part = yaml_content.partition("\n---\n")
+    if separator:
+        data = next(yaml.load_all(session_part, Loader=loader), None)
+        if isinstance(data, dict):
+            return session_from_dict(data, repo_path)
+
+    docs = list(yaml.load_all(yaml_content, Loader=loader))
 
     if len(docs) < 2:
         # Single document - just session data (old format or simplified)
@@ -410,9 +441,23 @@ def save_session(session: ReviewSession, diff_context: str = "") -> Path:
     """
     path = get_session_path(session)
 
-    yaml_content = session_to_yaml(session, diff_context)
-    with open(path, "w") as f:
-        f.write(yaml_content)
+    yaml_content = session_to_yaml(session, diff_context).encode()
+    try:
+        if path.read_bytes() == yaml_content:
+            # Nothing changed (e.g. an autosave after navigation only);
+            # leaving the file alone also keeps file watchers quiet
+            return path
+    except OSError:
+        pass
+
+    # Write to a temporary file and rename it into place, so readers never
+    # see a partially written session
+    tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    try:
+        tmp_path.write_bytes(yaml_content)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     return path
 
@@ -1,10 +1,151 @@
 """File watcher for session hot reload."""
 
 import asyncio
+import hashlib
+import inspect
+import os
+import subprocess
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Awaitable, Callable
 
-from watchfiles import awatch, Change
+# watchfiles itself is imported where the watch loops start, so importing
+# this module doesn't load its native extension
+if TYPE_CHECKING:
+    from watchfiles import Change
+
+
+# Bytes hashed from each end of the session file for its save signature
+_SIGNATURE_EDGE_BYTES = 4096
+
+
+def _file_fingerprint(path: Path) -> tuple[int, int, int] | None:
+    """Identify a file version by mtime (ns), size and inode with one stat.
+
+    Saves replace the file atomically, so each one gets a new inode.
+    Returns None if the file doesn't exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _edge_digest(path: Path) -> bytes | None:
+    """Hash the first and last few KB of a file.
+
+    Backs up the fingerprint on filesystems with coarse mtimes, where an
+    in-place write of the same size could otherwise look unchanged.
+    Returns None if the file can't be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(_SIGNATURE_EDGE_BYTES), digest_size=8)
+            if os.fstat(f.fileno()).st_size > 2 * _SIGNATURE_EDGE_BYTES:
+                f.seek(-_SIGNATURE_EDGE_BYTES, os.SEEK_END)
+            digest.update(f.read())
+    except OSError:
+        return None
+    return digest.digest()
+
+
+async def _call(callback: Callable[[], Awaitable[None] | None]) -> None:
+    """Invoke a change callback, awaiting it if it's asynchronous."""
+    result = callback()
+    if inspect.isawaitable(result):
+        await result
+
+
+class _RepoFilter:
+    """Watch filter for repository changes that can affect the diff.
+
+    Builds on watchfiles' default filter, which already skips ``.git``,
+    ``__pycache__``, virtualenvs and ``*.pyc`` files.
+    """
+
+    def __init__(self, session_file: Path | None = None, ignored_dirs: tuple[str, ...] = ()):
+        from watchfiles import DefaultFilter
+
+        # Directories git ignores are skipped along with the default ones
+        self._default_filter = DefaultFilter(ignore_paths=ignored_dirs)
+        self._ignored_dirs = ignored_dirs
+        self.session_file = session_file
+        # Plain string forms, so checking an event builds no Path objects
+        self._session_str = os.fspath(session_file) if session_file else None
+
+    def __call__(self, change: "Change", path: str) -> bool:
+        # Skip session file (watched separately)
+        if path == self._session_str:
+            return False
+        # Skip hidden files, finding the basename without building a Path
+        name_start = path.rfind(os.sep) + 1
+        if os.altsep:
+            # Windows also accepts "/", which can come in via the repo path
+            name_start = max(name_start, path.rfind(os.altsep) + 1)
+        if path.startswith(".", name_start):
+            return False
+        return self._default_filter(change, path)
+
+    def keeps_dir(self, path: str) -> bool:
+        """Check if changes inside a directory would get through the filter."""
+        from watchfiles import Change
+
+        # Ignored directories are stored with a trailing separator
+        return self(Change.added, path) and not (path + os.sep).startswith(
+            self._ignored_dirs
+        )
+
+
+def _git_ignored_dirs(repo_path: Path) -> tuple[str, ...]:
+    """List the directories git ignores in a repository, as path prefixes.
+
+    Each ends with a separator, so a prefix only matches paths inside that
+    directory. Returns an empty tuple if git can't tell (e.g. not a repo).
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(repo_path),
+                "ls-files",
+                "--others",
+                "--ignored",
+                "--exclude-standard",
+                "--directory",
+                "-z",
+            ],
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ()
+    root = os.fspath(repo_path)
+    # With --directory, wholly ignored directories are listed once, as "dir/"
+    return tuple(
+        os.path.join(root, os.fsdecode(entry[:-1])) + os.sep
+        for entry in result.stdout.split(b"\0")
+        if entry.endswith(b"/")
+    )
+
+
+# Repositories with at least this many top-level directories to watch get
+# one watcher per directory; below it, the extra threads aren't worth it
+_SPLIT_MIN_DIRS = 5
+
+
+def _top_level_dirs(repo_path: Path, watch_filter: "_RepoFilter") -> list[str]:
+    """List the top-level directories of a repository that the filter keeps."""
+    try:
+        with os.scandir(repo_path) as entries:
+            return [
+                entry.path
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and watch_filter.keeps_dir(entry.path)
+            ]
+    except OSError:
+        return []
 
 
 class SessionWatcher:
@@ -17,68 +158,93 @@ class SessionWatcher:
     def __init__(
         self,
         session_path: Path,
-        on_change: Callable[[], None],
+        on_change: Callable[[], Awaitable[None] | None],
         debounce_ms: int = 500,
+        step_ms: int = 50,
     ):
         """Initialize the watcher.
 
         Args:
             session_path: Path to the session YAML file
-            on_change: Callback to invoke when file changes externally
-            debounce_ms: Debounce time in milliseconds
+            on_change: Callback to invoke when file changes externally; if
+                it returns an awaitable, it is awaited before further changes
+            debounce_ms: Maximum time in milliseconds to group changes
+            step_ms: Quiet time in milliseconds that ends a group early
         """
         self.session_path = session_path
+        # Event paths are joined onto the watched directory as given, so a
+        # plain string comparison matches them without building Paths
+        self._session_str = os.fspath(session_path)
         self.on_change = on_change
         self.debounce_ms = debounce_ms
+        self.step_ms = step_ms
         self._task: asyncio.Task | None = None
-        self._stop_event = asyncio.Event()
-        self._last_save_mtime: float | None = None
+        self._running = False
+        self._last_save_fingerprint: tuple[int, int, int] | None = None
+        self._last_save_digest: bytes | None = None
 
     def mark_our_save(self) -> None:
         """Mark that we just saved the file.
 
         Call this after saving to prevent triggering reload for our own changes.
         """
-        if self.session_path.exists():
-            self._last_save_mtime = self.session_path.stat().st_mtime
+        self._last_save_fingerprint = _file_fingerprint(self.session_path)
+        self._last_save_digest = _edge_digest(self.session_path)
 
     async def _watch_loop(self) -> None:
         """Main watch loop."""
+        from watchfiles import Change, awatch
+
         try:
+            # Only the session file itself is of interest, so don't recurse
+            # into the repository and drop other paths before they're yielded
             async for changes in awatch(
                 self.session_path.parent,
                 debounce=self.debounce_ms,
-                stop_event=self._stop_event,
+                step=self.step_ms,
+                recursive=False,
+                watch_filter=self._is_session_change,
             ):
-                # Check if our file was modified
-                for change_type, changed_path in changes:
-                    if Path(changed_path) == self.session_path:
-                        if change_type in (Change.modified, Change.added):
-                            # Check if this was our own save
-                            if self.session_path.exists():
-                                current_mtime = self.session_path.stat().st_mtime
-                                if (
-                                    self._last_save_mtime is not None
-                                    and current_mtime == self._last_save_mtime
-                                ):
-                                    # This was our own save, ignore
-                                    continue
-
-                            # External change - trigger reload
-                            self.on_change()
+                # Changes arrive already grouped, so reload at most once per batch
+                if not any(
+                    change_type in (Change.modified, Change.added)
+                    for change_type, _ in changes
+                ):
+                    continue
+
+                # Check if this was our own save: one stat tells most external
+                # writes apart, and the file is only read if that matches
+                fingerprint = _file_fingerprint(self.session_path)
+                if (
+                    fingerprint is not None
+                    and fingerprint == self._last_save_fingerprint
+                    and _edge_digest(self.session_path) == self._last_save_digest
+                ):
+                    # This was our own save, ignore
+                    continue
+
+                # External change - trigger reload
+                await _call(self.on_change)
 
         except asyncio.CancelledError:
             pass
 
+    def _is_session_change(self, change: "Change", path: str) -> bool:
+        """Watch filter accepting only changes to the session file."""
+        return path == self._session_str
+
     def start(self) -> None:
         """Start watching the file."""
         if self._task is None or self._task.done():
-            self._stop_event.clear()
             self._task = asyncio.create_task(self._watch_loop())
+            self._task.add_done_callback(self._on_task_done)
+            self._running = True
 
     def stop(self) -> None:
         """Stop watching the file."""
-        self._stop_event.set()
+        self._running = False
+        # Cancelling the task is enough: awatch stops its watcher thread
+        # when cancelled
         if self._task and not self._task.done():
             self._task.cancel()
         self._task = None
@@ -86,7 +252,13 @@ class SessionWatcher:
     @property
     def is_running(self) -> bool:
         """Check if the watcher is running."""
-        return self._task is not None and not self._task.done()
+        return self._running
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """Clear the running flag when the watch task ends on its own."""
+        # A task stopped and replaced by a newer one must not clear the flag
+        if task is self._task:
+            self._running = False
 
 
 class DiffWatcher:
@@ -98,64 +270,128 @@ class DiffWatcher:
     def __init__(
         self,
         repo_path: Path,
-        on_change: Callable[[], None],
+        on_change: Callable[[], Awaitable[None] | None],
         session_file: Path | None = None,
         debounce_ms: int = 1000,
+        step_ms: int = 50,
     ):
         """Initialize the watcher.
 
         Args:
             repo_path: Path to the repository root
-            on_change: Callback to invoke when files change
+            on_change: Callback to invoke when files change; if it returns
+                an awaitable, it is awaited before further changes
             session_file: Session file to ignore (already watched separately)
-            debounce_ms: Debounce time in milliseconds
+            debounce_ms: Maximum time in milliseconds to group changes
+            step_ms: Quiet time in milliseconds that ends a group early
         """
         self.repo_path = repo_path
         self.on_change = on_change
         self.session_file = session_file
         self.debounce_ms = debounce_ms
+        self.step_ms = step_ms
         self._task: asyncio.Task | None = None
-        self._stop_event = asyncio.Event()
+        self._running = False
 
     async def _watch_loop(self) -> None:
         """Main watch loop."""
+        from watchfiles import awatch
+
         try:
-            async for changes in awatch(
+            # Changes under ignored directories (build output, dependencies)
+            # can't affect the diff; git knows which ones they are
+            ignored_dirs = await asyncio.to_thread(_git_ignored_dirs, self.repo_path)
+            watch_filter = _RepoFilter(self.session_file, ignored_dirs)
+            top_dirs = _top_level_dirs(self.repo_path, watch_filter)
+            if len(top_dirs) >= _SPLIT_MIN_DIRS:
+                await self._watch_split(top_dirs, watch_filter)
+                return
+
+            # Irrelevant paths are dropped by the filter, so every batch
+            # yielded here contains at least one relevant change
+            async for _ in awatch(
                 self.repo_path,
                 debounce=self.debounce_ms,
-                stop_event=self._stop_event,
+                step=self.step_ms,
                 recursive=True,
+                watch_filter=watch_filter,
             ):
-                # Filter out session file and .git directory changes
-                relevant_changes = []
-                for change_type, changed_path in changes:
-                    path = Path(changed_path)
-                    # Skip .git directory
-                    if ".git" in path.parts:
-                        continue
-                    # Skip session file (watched separately)
-                    if self.session_file and path == self.session_file:
-                        continue
-                    # Skip hidden files
-                    if path.name.startswith("."):
-                        continue
-                    relevant_changes.append((change_type, changed_path))
-
-                if relevant_changes:
-                    self.on_change()
+                await _call(self.on_change)
 
         except asyncio.CancelledError:
             pass
 
+    async def _watch_split(self, top_dirs: list[str], watch_filter: _RepoFilter) -> None:
+        """Watch each top-level directory separately, merging their changes.
+
+        Each directory gets its own watcher thread, so a burst of changes
+        across the tree (e.g. a branch switch) is read by several at once.
+        Files directly in the repository root are watched on their own.
+        """
+        from watchfiles import Change, awatch
+
+        changed = asyncio.Event()
+        feeds: dict[str, asyncio.Task] = {}
+
+        async def feed(path: str, recursive: bool) -> None:
+            try:
+                async for changes in awatch(
+                    path,
+                    debounce=self.debounce_ms,
+                    step=self.step_ms,
+                    recursive=recursive,
+                    watch_filter=watch_filter,
+                ):
+                    if not recursive:
+                        # A new or re-created top-level directory (say, after
+                        # a branch switch) needs a fresh watcher of its own
+                        for change_type, changed_path in changes:
+                            if (
+                                change_type == Change.added
+                                and os.path.isdir(changed_path)
+                                and watch_filter.keeps_dir(changed_path)
+                            ):
+                                start_feed(changed_path)
+                    changed.set()
+            except (OSError, RuntimeError):
+                # The directory went away; the root watcher restarts it if
+                # it comes back
+                pass
+
+        def start_feed(path: str) -> None:
+            old = feeds.pop(path, None)
+            if old is not None:
+                old.cancel()
+            feeds[path] = asyncio.create_task(feed(path, recursive=True))
+
+        for path in top_dirs:
+            start_feed(path)
+        root_feed = asyncio.create_task(feed(os.fspath(self.repo_path), recursive=False))
+        try:
+            while True:
+                await changed.wait()
+                # Let batches from other directories in the same burst
+                # arrive, so they share one callback
+                await asyncio.sleep(self.step_ms / 1000)
+                changed.clear()
+                await _call(self.on_change)
+        finally:
+            root_feed.cancel()
+            for task in feeds.values():
+                task.cancel()
+
     def start(self) -> None:
         """Start watching the repository."""
         if self._task is None or self._task.done():
-            self._stop_event.clear()
             self._task = asyncio.create_task(self._watch_loop())
+            self._task.add_done_callback(self._on_task_done)
+            self._running = True
 
     def stop(self) -> None:
         """Stop watching."""
-        self._stop_event.set()
+        self._running = False
+        # Cancelling the task is enough: awatch stops its watcher thread
+        # when cancelled
         if self._task and not self._task.done():
             self._task.cancel()
         self._task = None
@@ -163,4 +399,10 @@ class DiffWatcher:
     @property
     def is_running(self) -> bool:
         """Check if the watcher is running."""
-        return self._task is not None and not self._task.done()
+        return self._running
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """Clear the running flag when the watch task ends on its own."""
+        # A task stopped and replaced by a newer one must not clear the flag
+        if task is self._task:
+            self._running = False
@@ -24,22 +24,26 @@ class CommentCategory(Enum):
     @property
     def label(self) -> str:
         """Get display label for the category."""
-        return self.value.upper()
+        return _CATEGORY_LABELS[self]
 
     @property
     def description(self) -> str:
         """Get description of what this category means."""
-        descriptions = {
-            CommentCategory.NOTE: "observations",
-            CommentCategory.SUGGESTION: "improvements",
-            CommentCategory.ISSUE: "problems to fix",
-            CommentCategory.PRAISE: "positive feedback",
-            CommentCategory.AI_ANALYSIS: "AI-generated analysis",
-        }
-        return descriptions[self]
+        return _CATEGORY_DESCRIPTIONS[self]
 
 
-@dataclass
+# Built once rather than on every property access
+_CATEGORY_LABELS = {category: category.value.upper() for category in CommentCategory}
+_CATEGORY_DESCRIPTIONS = {
+    CommentCategory.NOTE: "observations",
+    CommentCategory.SUGGESTION: "improvements",
+    CommentCategory.ISSUE: "problems to fix",
+    CommentCategory.PRAISE: "positive feedback",
+    CommentCategory.AI_ANALYSIS: "AI-generated analysis",
+}
+
+
+@dataclass(slots=True)
 class Comment:
     """A review comment."""
 
@@ -51,8 +55,9 @@ class Comment:
     line_no_end: int | None = None  # End of range (None = single line)
     is_deleted_line: bool = False  # True if commenting on a deleted line
     id: str = field(default_factory=lambda: str(uuid4()))
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    # Unset timestamps are filled in by __post_init__ from one clock read
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
     # Diff context - the hunk content being commented on (for LLM awareness)
     context: str | None = None
@@ -61,6 +66,25 @@ class Comment:
     llm_response: str | None = None
     llm_session_id: str | None = None
 
+    # Derived from the fields above, which don't change after creation
+    _is_ai: bool = field(default=False, init=False, repr=False, compare=False)
+    _line_range: tuple[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _location: str | None = field(default=None, init=False, repr=False, compare=False)
+    # Bounds tested by covers_line(); the default is an empty range
+    _start: int = field(default=0, init=False, repr=False, compare=False)
+    _end: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self._is_ai = self.author.startswith(AI_AUTHOR_PREFIX)
+        if self.line_no is not None:
+            end = self.line_no_end if self.line_no_end is not None else self.line_no
+            self._line_range = (min(self.line_no, end), max(self.line_no, end))
+            self._start, self._end = self._line_range
+
     @property
     def is_ai(self) -> bool:
         """Check if this comment was authored by an AI.
@@ -68,7 +92,7 @@ class Comment:
         AI authors use format: 'Agent (Model/Version)'
         Example: 'Agent (Claude/Opus-4.5)'
         """
-        return self.author.startswith(AI_AUTHOR_PREFIX)
+        return self._is_ai
 
     @property
     def is_range(self) -> bool:
@@ -78,19 +102,11 @@ class Comment:
     @property
     def line_range(self) -> tuple[int, int] | None:
         """Get the line range as (start, end) tuple, or None for file-level."""
-        if self.line_no is None:
-            return None
-        end = self.line_no_end if self.line_no_end is not None else self.line_no
-        return (min(self.line_no, end), max(self.line_no, end))
+        return self._line_range
 
     def covers_line(self, line_no: int) -> bool:
         """Check if this comment covers the given line number."""
-        if self.line_no is None:
-            return False
-        if self.line_no_end is None:
-            return self.line_no == line_no
-        start, end = self.line_range
-        return start <= line_no <= end
+        return self._start <= line_no <= self._end
 
     @property
     def location(self) -> str:
@@ -102,15 +118,17 @@ class Comment:
         - Single line: `path:linenum`
         - File comments: `path`
         """
-        if self.line_no is None:
-            return f"`{self.file_path}`"
-        elif self.is_range:
-            start, end = self.line_range
-            return f"`{self.file_path}:{start}-{end}`"
-        elif self.is_deleted_line:
-            return f"`{self.file_path}:~{self.line_no}`"
-        else:
-            return f"`{self.file_path}:{self.line_no}`"
+        if self._location is None:
+            if self.line_no is None:
+                self._location = f"`{self.file_path}`"
+            elif self.is_range:
+                start, end = self._line_range
+                self._location = f"`{self.file_path}:{start}-{end}`"
+            elif self.is_deleted_line:
+                self._location = f"`{self.file_path}:~{self.line_no}`"
+            else:
+                self._location = f"`{self.file_path}:{self.line_no}`"
+        return self._location
 
     @property
     def location_short(self) -> str:
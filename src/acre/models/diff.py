@@ -17,7 +17,28 @@ class LineType(Enum):
     HEADER = "header"
 
 
-@dataclass
+# Byte recorded per line in DiffHunk.line_types
+_LINE_TYPE_BYTES = {
+    LineType.CONTEXT: ord(" "),
+    LineType.ADDITION: ord("+"),
+    LineType.DELETION: ord("-"),
+    LineType.HEADER: ord("H"),
+}
+
+# unidiff line markers, with the line type and its byte; anything else
+# (e.g. "\\ No newline") is context
+_LINE_TYPES = {
+    marker: (line_type, _LINE_TYPE_BYTES[line_type])
+    for marker, line_type in (
+        ("+", LineType.ADDITION),
+        ("-", LineType.DELETION),
+        (" ", LineType.CONTEXT),
+    )
+}
+_CONTEXT_TYPE = _LINE_TYPES[" "]
+
+
+@dataclass(slots=True)
 class DiffLine:
     """A single line in a diff."""
 
@@ -39,7 +60,7 @@ class DiffLine:
         return self.line_type == LineType.DELETION
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffHunk:
     """A contiguous block of changes."""
 
@@ -49,40 +70,80 @@ class DiffHunk:
     new_count: int
     header: str
     lines: list[DiffLine] = field(default_factory=list)
+    # One byte per line type, recorded while parsing or built on first use
+    _line_types: bytes | None = field(default=None, init=False, repr=False, compare=False)
+    # Line counts, taken from the line types on first use
+    _added: int | None = field(default=None, init=False, repr=False, compare=False)
+    _removed: int | None = field(default=None, init=False, repr=False, compare=False)
+    # Content part of get_id(), computed on first use
+    _id_hash: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def line_types(self) -> bytes:
+        """The type of each line as one byte: ``+``, ``-``, space or ``H``.
+
+        Lets scans that only need line types skip the DiffLine objects.
+        """
+        if self._line_types is None:
+            self._line_types = bytes(
+                _LINE_TYPE_BYTES[line.line_type] for line in self.lines
+            )
+        return self._line_types
+
+    @property
+    def added_lines(self) -> int:
+        """Count of added lines."""
+        if self._added is None:
+            self._added = self.line_types.count(b"+")
+        return self._added
+
+    @property
+    def removed_lines(self) -> int:
+        """Count of removed lines."""
+        if self._removed is None:
+            self._removed = self.line_types.count(b"-")
+        return self._removed
 
     def get_id(self, file_path: str) -> str:
         """Generate a stable identifier for this hunk.
 
         Uses position info plus first few lines of content for uniqueness.
         """
-        content = f"{self.old_start}:{self.old_count}:{self.new_start}:{self.new_count}"
-        for line in self.lines[:3]:
-            content += line.content
-        hash_part = hashlib.md5(content.encode()).hexdigest()[:12]
+        hash_part = self._id_hash
+        if hash_part is None:
+            # MD5 stays: these IDs are stored in saved sessions. The pieces
+            # are fed to it one by one rather than joined into one string.
+            digest = hashlib.md5(
+                f"{self.old_start}:{self.old_count}:{self.new_start}:{self.new_count}".encode(),
+                usedforsecurity=False,
+            )
+            for line in self.lines[:3]:
+                digest.update(line.content.encode())
+            hash_part = self._id_hash = digest.hexdigest()[:12]
         return f"{file_path}::{hash_part}"
 
     @classmethod
     def from_unidiff(cls, hunk: Hunk) -> "DiffHunk":
         """Create DiffHunk from unidiff Hunk."""
         lines = []
+        append = lines.append
+        line_types = bytearray()
+        append_type = line_types.append
+        # unidiff's is_added/is_removed are properties comparing line_type;
+        # reading the marker once and looking it up is cheaper per line
         for line in hunk:
-            if line.is_added:
-                line_type = LineType.ADDITION
-            elif line.is_removed:
-                line_type = LineType.DELETION
-            else:
-                line_type = LineType.CONTEXT
-
-            lines.append(
+            line_type, type_byte = _LINE_TYPES.get(line.line_type, _CONTEXT_TYPE)
+            append_type(type_byte)
+            append(
                 DiffLine(
-                    line_type=line_type,
-                    content=line.value.rstrip("\n"),
-                    old_line_no=line.source_line_no,
-                    new_line_no=line.target_line_no,
+                    line_type,
+                    line.value.rstrip("\r\n"),
+                    line.source_line_no,
+                    line.target_line_no,
                 )
             )
 
-        return cls(
+        diff_hunk = cls(
             old_start=hunk.source_start,
             old_count=hunk.source_length,
             new_start=hunk.target_start,
@@ -90,9 +151,11 @@ class DiffHunk:
             header=hunk.section_header or "",
             lines=lines,
         )
+        diff_hunk._line_types = bytes(line_types)
+        return diff_hunk
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffFile:
     """A single file's diff."""
 
@@ -102,26 +165,23 @@ class DiffFile:
     status: Literal["modified", "added", "deleted", "renamed", "untracked"]
     hunks: list[DiffHunk] = field(default_factory=list)
     is_binary: bool = False
+    # Line counts summed from the hunks on first use
+    _added: int | None = field(default=None, init=False, repr=False, compare=False)
+    _removed: int | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def added_lines(self) -> int:
         """Count of added lines."""
-        return sum(
-            1
-            for hunk in self.hunks
-            for line in hunk.lines
-            if line.line_type == LineType.ADDITION
-        )
+        if self._added is None:
+            self._added = sum(hunk.added_lines for hunk in self.hunks)
+        return self._added
 
     @property
     def removed_lines(self) -> int:
         """Count of removed lines."""
-        return sum(
-            1
-            for hunk in self.hunks
-            for line in hunk.lines
-            if line.line_type == LineType.DELETION
-        )
+        if self._removed is None:
+            self._removed = sum(hunk.removed_lines for hunk in self.hunks)
+        return self._removed
 
     @classmethod
     def from_unidiff(cls, patched_file: PatchedFile) -> "DiffFile":
@@ -161,7 +221,7 @@ class DiffFile:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffSet:
     """Complete set of diffs for a review."""
 
@@ -15,6 +15,20 @@ CATEGORY_INFO = {
 }
 
 
+# Legend line for the export header; the categories are fixed
+_LEGEND = "Comment types: " + ", ".join(
+    f"{label} ({desc})" for label, desc in CATEGORY_INFO.values()
+)
+
+# Opening line for each diff source type, formatted with its ref
+_SOURCE_HEADERS = {
+    "commit": "Reviewing commit: {:.7}",
+    "branch": "Reviewing changes: {}",
+    "pr": "Reviewing PR #{}",
+    "commits": "Reviewing commits: {}",
+}
+
+
 class ExportFormat(Enum):
     """Supported export formats."""
 
@@ -47,47 +61,33 @@ class ReviewExport:
         4. Session summary (if notes exist)
         5. Numbered comment list
         """
-        lines = []
-
-        # Opening statement
-        lines.append(
-            "I reviewed your code and have the following comments. Please address them."
-        )
-        lines.append("")
+        session = self.session
+        lines = [
+            "I reviewed your code and have the following comments. Please address them.",
+            "",
+        ]
 
         # Commit range info
-        if self.session.diff_source_type == "commit":
-            if self.session.diff_source_ref:
-                lines.append(f"Reviewing commit: {self.session.diff_source_ref[:7]}")
-                lines.append("")
-        elif self.session.diff_source_type == "branch":
-            if self.session.diff_source_ref:
-                lines.append(f"Reviewing changes: {self.session.diff_source_ref}")
-                lines.append("")
-        elif self.session.diff_source_type == "pr":
-            if self.session.diff_source_ref:
-                lines.append(f"Reviewing PR #{self.session.diff_source_ref}")
-                lines.append("")
+        header = _SOURCE_HEADERS.get(session.diff_source_type)
+        if header and session.diff_source_ref:
+            lines += (header.format(session.diff_source_ref), "")
 
         # Comment type legend
-        legend_parts = [
-            f"{label} ({desc})" for label, desc in CATEGORY_INFO.values()
-        ]
-        lines.append(f"Comment types: {', '.join(legend_parts)}")
-        lines.append("")
+        lines += (_LEGEND, "")
 
         # Session summary
-        if self.session.notes:
-            lines.append(f"Summary: {self.session.notes}")
-            lines.append("")
+        if session.notes:
+            lines += (f"Summary: {session.notes}", "")
 
         # Numbered comment list
-        comments = self.session.all_comments
+        comments = session.all_comments
         if not comments:
             lines.append("No comments.")
         else:
-            for i, comment in enumerate(comments, 1):
-                lines.append(_format_comment_line(comment, i))
+            lines += (
+                _format_comment_line(comment, i)
+                for i, comment in enumerate(comments, 1)
+            )
 
         return "\n".join(lines)
 
@@ -4,12 +4,17 @@ This module provides a facade that wraps OpenCodeReview's append-only
 activity model with the mutable interface that acre's UI expects.
 """
 
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Literal
 from uuid import uuid4
+import hashlib
+import os
+import re
 import subprocess
+import tempfile
 from functools import lru_cache
 
 from opencodereview import (
@@ -202,6 +207,7 @@ DIFF_SOURCE_TO_SUBJECT = {
     "branch": ("patch", "git-branch"),
     "commit": ("commit", "git"),
     "pr": ("patch", "github-pr"),
+    "commits": ("patch", "git-commits"),
 }
 
 # Map acre categories to OCR categories
@@ -224,25 +230,123 @@ OCR_TO_ACRE_CATEGORY = {
 }
 
 
+def _same_contents(path: Path, other: Path) -> bool:
+    """Whether two files have identical contents (False if either is missing)."""
+    try:
+        return path.read_bytes() == other.read_bytes()
+    except OSError:
+        return False
+
+
+def _file_fingerprint(path: Path) -> tuple[str, int, int, int] | None:
+    """Identify a version of a file by path, mtime (ns), size and inode.
+
+    Returns None if the file doesn't exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.fspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# Sessions with more activities than this get a JSON copy in the cache
+# directory when acre exits, which loads much faster than the XML or YAML
+# file itself
+_JSON_CACHE_MIN_ACTIVITIES = 500
+
+_SESSION_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "acre" / "sessions"
+)
+
+
+def _json_cache_path(fingerprint: tuple[str, int, int, int]) -> Path:
+    """Get the path of the JSON copy of one version of a session file.
+
+    The name holds a digest of the session file's path plus its whole
+    fingerprint (mtime, size and inode), so a copy only ever matches the
+    exact version of the file it was written from.
+    """
+    path, mtime_ns, size, ino = fingerprint
+    digest = hashlib.blake2b(os.fsencode(os.path.abspath(path)), digest_size=16).hexdigest()
+    return _SESSION_CACHE_DIR / f"{digest}-{mtime_ns}-{size}-{ino}.json"
+
+
+def _load_json_cache(
+    path: Path,
+    fingerprint: tuple[str, int, int, int] | None,
+) -> Review | None:
+    """Load a session from its JSON copy, if there is one for this version."""
+    if fingerprint is None or path.suffix == ".json":
+        return None
+    try:
+        return ocr_load(_json_cache_path(fingerprint))
+    except Exception:
+        return None
+
+
+def _write_json_cache(review: Review, fingerprint: tuple[str, int, int, int]) -> None:
+    """Write the JSON copy of a session file; failures are ignored.
+
+    Copies of earlier versions of the same file are removed.
+    """
+    cache_path = _json_cache_path(fingerprint)
+    if cache_path.exists():
+        # Already written for this version of the file
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".json")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            ocr_dump(review, tmp_path)
+            os.replace(tmp_path, cache_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        prefix = cache_path.name.split("-", 1)[0]
+        for old in cache_path.parent.glob(f"{prefix}-*.json"):
+            if old != cache_path:
+                old.unlink(missing_ok=True)
+    except Exception:
+        pass
+
+
+# Output lines of git config --get-regexp for the user settings
+_GIT_USER_RE = re.compile(r"^user\.(name|email) (.*)$", re.MULTILINE)
+
+
 @lru_cache(maxsize=1)
-def get_git_user() -> tuple[str, str | None]:
-    """Get git user as (name, email) tuple."""
+def read_git_user() -> tuple[str, str]:
+    """Read the git user's name and email, each empty if not set.
+
+    The author environment variables take precedence, as they do for git
+    itself; otherwise both values are read with a single git config call.
+    """
+    name = os.environ.get("GIT_AUTHOR_NAME", "").strip()
+    email = os.environ.get("GIT_AUTHOR_EMAIL", "").strip()
+    if name and email:
+        return (name, email)
     try:
-        name = subprocess.run(
-            ["git", "config", "user.name"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        ).stdout.strip()
-        email = subprocess.run(
-            ["git", "config", "user.email"],
+        output = subprocess.run(
+            ["git", "config", "--get-regexp", r"^user\.(name|email)$"],
             capture_output=True,
             text=True,
             timeout=5,
-        ).stdout.strip()
-        return (name or "Anonymous", email or None)
+        ).stdout
     except Exception:
-        return ("Anonymous", None)
+        output = ""
+    # One "user.<key> <value>" line per setting; the last one wins
+    config = dict(_GIT_USER_RE.findall(output))
+    name = name or config.get("name", "").strip()
+    email = email or config.get("email", "").strip()
+    return (name, email)
+
+
+def get_git_user() -> tuple[str, str | None]:
+    """Get git user as (name, email) tuple."""
+    name, email = read_git_user()
+    return (name or "Anonymous", email or None)
 
 
 def make_human_author() -> Author:
@@ -261,7 +365,28 @@ def is_agent_author(author: Author | None) -> bool:
     return author is not None and author.type == "agent"
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_timestamp(created: str) -> datetime:
+    """Parse an activity's ISO 8601 ``created`` timestamp.
+
+    Python 3.11's fromisoformat accepts the trailing ``Z`` itself.
+    """
+    return datetime.fromisoformat(created)
+
+
+def _author_string(author: Author | None) -> str:
+    """Format an OCR author in acre's author string format."""
+    if author is None:
+        return "human"
+    if author.type == "agent":
+        model = author.model or "unknown"
+        return f"Agent ({author.name}/{model})"
+    if author.email:
+        return f"{author.name} <{author.email}>"
+    return author.name or "human"
+
+
+@dataclass(slots=True)
 class CommentView:
     """A view of an OCR Comment adapted for acre's UI.
 
@@ -269,6 +394,37 @@ class CommentView:
     """
     _comment: OCRComment
 
+    # Derived from the comment's category, author and location, which don't
+    # change once it's created (edits supersede it with a new comment)
+    _category: str = field(default="note", init=False, repr=False, compare=False)
+    _author: str = field(default="human", init=False, repr=False, compare=False)
+    _is_ai: bool = field(default=False, init=False, repr=False, compare=False)
+    _file_path: str = field(default="", init=False, repr=False, compare=False)
+    _line_no: int | None = field(default=None, init=False, repr=False, compare=False)
+    _line_no_end: int | None = field(default=None, init=False, repr=False, compare=False)
+    _line_range: tuple[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _location: str | None = field(default=None, init=False, repr=False, compare=False)
+    _created_at: datetime | None = field(default=None, init=False, repr=False, compare=False)
+    # Bounds tested by covers_line(); the default is an empty range
+    _start: int = field(default=0, init=False, repr=False, compare=False)
+    _end: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        comment = self._comment
+        self._category = OCR_TO_ACRE_CATEGORY.get(comment.category, "note")
+        self._author = _author_string(comment.author)
+        self._is_ai = is_agent_author(comment.author)
+        location = comment.location
+        if location:
+            self._file_path = location.file or ""
+            if location.lines:
+                line_no, line_no_end = location.lines[0]
+                self._line_no = line_no
+                self._line_no_end = line_no_end
+                end = line_no_end if line_no_end else line_no
+                self._line_range = (min(line_no, end), max(line_no, end))
+                self._start, self._end = self._line_range
+
     @property
     def id(self) -> str:
         return self._comment.id
@@ -280,42 +436,28 @@ class CommentView:
     @property
     def category(self) -> str:
         """Return acre-compatible category string."""
-        return OCR_TO_ACRE_CATEGORY.get(self._comment.category, "note")
+        return self._category
 
     @property
     def author(self) -> str:
         """Return author as string in acre format."""
-        if self._comment.author is None:
-            return "human"
-        a = self._comment.author
-        if a.type == "agent":
-            model = a.model or "unknown"
-            return f"Agent ({a.name}/{model})"
-        if a.email:
-            return f"{a.name} <{a.email}>"
-        return a.name or "human"
+        return self._author
 
     @property
     def is_ai(self) -> bool:
-        return is_agent_author(self._comment.author)
+        return self._is_ai
 
     @property
     def file_path(self) -> str:
-        if self._comment.location:
-            return self._comment.location.file or ""
-        return ""
+        return self._file_path
 
     @property
     def line_no(self) -> int | None:
-        if self._comment.location and self._comment.location.lines:
-            return self._comment.location.lines[0][0]
-        return None
+        return self._line_no
 
     @property
     def line_no_end(self) -> int | None:
-        if self._comment.location and self._comment.location.lines:
-            return self._comment.location.lines[0][1]
-        return None
+        return self._line_no_end
 
     @property
     def is_deleted_line(self) -> bool:
@@ -324,28 +466,22 @@ class CommentView:
 
     @property
     def line_range(self) -> tuple[int, int] | None:
-        if self.line_no is None:
-            return None
-        end = self.line_no_end if self.line_no_end else self.line_no
-        return (min(self.line_no, end), max(self.line_no, end))
+        return self._line_range
 
     @property
     def is_range(self) -> bool:
-        return self.line_no is not None and self.line_no_end is not None and self.line_no != self.line_no_end
+        return self._line_no_end is not None and self._line_no != self._line_no_end
 
     def covers_line(self, line_no: int) -> bool:
-        if self.line_no is None:
-            return False
-        if self.line_no_end is None:
-            return self.line_no == line_no
-        start, end = self.line_range
-        return start <= line_no <= end
+        return self._start <= line_no <= self._end
 
     @property
     def created_at(self) -> datetime:
-        if self._comment.created:
-            return datetime.fromisoformat(self._comment.created.replace("Z", "+00:00"))
-        return datetime.now()
+        if self._created_at is None:
+            if not self._comment.created:
+                return datetime.now()
+            self._created_at = _parse_timestamp(self._comment.created)
+        return self._created_at
 
     @property
     def updated_at(self) -> datetime:
@@ -372,23 +508,25 @@ class CommentView:
     @property
     def location(self) -> str:
         """Get formatted location string for export."""
-        if self.line_no is None:
-            return f"`{self.file_path}`"
-        elif self.is_range:
-            start, end = self.line_range
-            return f"`{self.file_path}:{start}-{end}`"
-        else:
-            return f"`{self.file_path}:{self.line_no}`"
+        if self._location is None:
+            if self._line_no is None:
+                self._location = f"`{self._file_path}`"
+            elif self.is_range:
+                start, end = self._line_range
+                self._location = f"`{self._file_path}:{start}-{end}`"
+            else:
+                self._location = f"`{self._file_path}:{self._line_no}`"
+        return self._location
 
     @property
     def location_short(self) -> str:
-        if self.line_no is None:
+        if self._line_no is None:
             return "file"
         elif self.is_range:
-            start, end = self.line_range
+            start, end = self._line_range
             return f"L{start}-{end}"
         else:
-            return f"L{self.line_no}"
+            return f"L{self._line_no}"
 
 
 @dataclass
@@ -422,6 +560,64 @@ class FileReviewState:
         return self._session._is_hunk_resolved(self.file_path, hunk_id)
 
 
+@dataclass(slots=True)
+class _ActivityIndex:
+    """Visible activities of a review, grouped for per-file queries."""
+
+    comments_by_file: dict[str, list[CommentView]] = field(default_factory=dict)
+    # Every visible comment, in export order
+    sorted_comments: list[CommentView] = field(default_factory=list)
+    # File path -> ID of its first file-level reviewed mark
+    reviewed_mark_ids: dict[str, str] = field(default_factory=dict)
+    hunks_by_file: dict[str, list[dict]] = field(default_factory=dict)
+    # (file path, hunk ID) -> ID of its first hunk review mark
+    hunk_mark_ids: dict[tuple[str, str], str] = field(default_factory=dict)
+    # First and latest activity timestamps (of all activities), on first use
+    timestamps: tuple[datetime | None, datetime | None] | None = None
+
+
+def _build_activity_index(review: Review) -> _ActivityIndex:
+    """Group a review's visible activities by file in one pass."""
+    index = _ActivityIndex()
+    comments: list[CommentView] = []
+    for activity in review.get_visible_activities():
+        if isinstance(activity, OCRComment):
+            view = CommentView(_comment=activity)
+            comments.append(view)
+            if activity.location:
+                index.comments_by_file.setdefault(activity.location.file, []).append(view)
+        elif isinstance(activity, ReviewMark) and activity.category == "reviewed":
+            location = activity.location
+            if not location:
+                continue
+            file_path = location.file
+            if not location.lines:
+                # File-level review mark
+                index.reviewed_mark_ids.setdefault(file_path, activity.id)
+                continue
+            # A hunk review, not file-level
+            hunks = index.hunks_by_file.setdefault(file_path, [])
+            for start, end in location.lines:
+                hunk_id = f"{file_path}::{start}-{end}"
+                hunks.append({
+                    "id": activity.id,
+                    "hunk_id": hunk_id,
+                    "file_path": file_path,
+                    "old_start": start,
+                    "old_count": end - start + 1,
+                    "new_start": start,
+                    "new_count": end - start + 1,
+                    "header": "",
+                    "lines_preview": "",
+                })
+                index.hunk_mark_ids.setdefault((file_path, hunk_id), activity.id)
+    index.sorted_comments = sorted(
+        comments,
+        key=lambda c: (c.file_path, c.line_no if c.line_no else 0)
+    )
+    return index
+
+
 @dataclass
 class AcreSession:
     """Wraps OCR Review with acre-specific operations.
@@ -432,18 +628,36 @@ class AcreSession:
 
     review: Review
     repo_path: Path
-    diff_source_type: Literal["uncommitted", "staged", "branch", "commit", "pr"]
+    diff_source_type: Literal["uncommitted", "staged", "branch", "commit", "pr", "commits"]
     diff_source_ref: str | None = None
     format: str = "xml"
 
     # Cached state computed from activities
     _file_paths: list[str] = field(default_factory=list)
+    # Author for the current git user, shared by every human activity
+    _cached_human_author: Author | None = field(default=None, repr=False)
+    # Index of the visible activities, and the activity list and length it
+    # was built from: activities are only ever appended, so a different
+    # length (or a replaced review) means it is out of date
+    _index: _ActivityIndex | None = field(default=None, repr=False)
+    _index_source: list | None = field(default=None, repr=False)
+    _index_len: int = field(default=-1, repr=False)
+    # Fingerprint of the session file as last loaded or saved; while it
+    # still matches, the file holds nothing we don't already have
+    _disk_fingerprint: tuple[str, int, int, int] | None = field(default=None, repr=False)
+    # One FileReviewState per path, reused for as long as the session lives,
+    # and the files dict built from them for the current file list (paths
+    # are only ever appended to it, or the list replaced)
+    _file_states: dict[str, FileReviewState] = field(default_factory=dict, repr=False)
+    _files_view: dict[str, FileReviewState] | None = field(default=None, repr=False)
+    _files_view_source: list[str] | None = field(default=None, repr=False)
+    _files_view_len: int = field(default=-1, repr=False)
 
     @classmethod
     def new(
         cls,
         repo_path: Path,
-        diff_source_type: Literal["uncommitted", "staged", "branch", "commit", "pr"],
+        diff_source_type: Literal["uncommitted", "staged", "branch", "commit", "pr", "commits"],
         diff_source_ref: str | None = None,
         format: str = "xml",
     ) -> "AcreSession":
@@ -473,7 +687,11 @@ class AcreSession:
     @classmethod
     def load(cls, path: Path, format: str = "xml") -> "AcreSession":
         """Load a session from disk."""
-        review = ocr_load(path)
+        # Taken before reading, so a write during the load isn't missed
+        fingerprint = _file_fingerprint(path)
+        review = _load_json_cache(path, fingerprint)
+        if review is None:
+            review = ocr_load(path)
 
         # Extract metadata from subject
         repo_path = path.parent
@@ -498,6 +716,10 @@ class AcreSession:
             diff_source_ref=diff_source_ref,
             format=format,
         )
+        # A JSON copy only matches the exact file version (path, mtime,
+        # size and inode) it was written from, so either way the session
+        # holds what the file does
+        session._disk_fingerprint = fingerprint
 
         # Initialize file paths from existing activities
         session._rebuild_file_paths()
@@ -510,26 +732,70 @@ class AcreSession:
         Uses load/dump pattern to avoid overwriting concurrent changes.
         Since OCR is append-only, we merge any external activities before saving.
         """
-        # Update instructions for current format
-        if self.review.agent_context is None:
-            self.review.agent_context = AgentContext()
-        self.review.agent_context.instructions = LLM_INSTRUCTIONS.get(self.format, "")
-
-        # Load current file to check for external changes
-        if path.exists():
+        # Update instructions for current format, leaving them alone if
+        # they're already current (they usually are, and a loaded copy is
+        # equal but not the same object)
+        instructions = LLM_INSTRUCTIONS.get(self.format, "")
+        agent_context = self.review.agent_context
+        if agent_context is None:
+            self.review.agent_context = AgentContext(instructions=instructions)
+        elif agent_context.instructions != instructions:
+            agent_context.instructions = instructions
+
+        # Load current file to check for external changes, unless it is
+        # still the version we last loaded or wrote
+        fingerprint = _file_fingerprint(path)
+        if fingerprint is not None and fingerprint != self._disk_fingerprint:
             try:
                 disk_review = ocr_load(path)
-                # Merge any activities from disk that we don't have
-                our_ids = {a.id for a in self.review.activities}
+                # Merge any activities from disk that we don't have, plus
+                # replies added on disk to comments we already hold
+                index_by_id = {a.id: i for i, a in enumerate(self.review.activities)}
                 for activity in disk_review.activities:
-                    if activity.id not in our_ids:
+                    index = index_by_id.get(activity.id)
+                    if index is None:
                         # External activity - add it to our review
+                        index_by_id[activity.id] = len(self.review.activities)
                         self.review.activities.append(activity)
+                    elif isinstance(activity, OCRComment) and activity.replies:
+                        ours = self.review.activities[index]
+                        if isinstance(ours, OCRComment):
+                            our_reply_ids = {r.id for r in ours.replies}
+                            for reply in activity.replies:
+                                if reply.id not in our_reply_ids:
+                                    ours.replies.append(reply)
             except Exception:
                 # If load fails, just save our version
                 pass
 
-        ocr_dump(self.review, path)
+        # Write to a temporary file and rename it into place so watchers
+        # never see a partially written session. It keeps the suffix so
+        # the format is still inferred from it (and, like the session file,
+        # is a dotfile the diff watcher ignores).
+        tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        try:
+            ocr_dump(self.review, tmp_path)
+            # Leave the file untouched if nothing changed, so watchers
+            # (ours and the agent's) don't see a spurious modification
+            if not _same_contents(tmp_path, path):
+                os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._disk_fingerprint = _file_fingerprint(path)
+
+    def write_json_copy(self, path: Path) -> None:
+        """Write the JSON copy of a large session file, to load faster next time.
+
+        This costs a full serialization, so it is meant for when the session
+        is done with (e.g. after the app exits), not for every save. Nothing
+        is written unless the file is still as last loaded or saved, or if
+        a copy of that version already exists.
+        """
+        if path.suffix == ".json" or len(self.review.activities) <= _JSON_CACHE_MIN_ACTIVITIES:
+            return
+        fingerprint = _file_fingerprint(path)
+        if fingerprint is not None and fingerprint == self._disk_fingerprint:
+            _write_json_cache(self.review, fingerprint)
 
     def _rebuild_file_paths(self) -> None:
         """Rebuild file paths from activities."""
@@ -544,6 +810,14 @@ class AcreSession:
         """Initialize file list."""
         self._file_paths = list(file_paths)
 
+    def add_files(self, file_paths: Iterable[str]) -> None:
+        """Add any of the given files not already in the file list."""
+        known = set(self._file_paths)
+        for path in file_paths:
+            if path not in known:
+                known.add(path)
+                self._file_paths.append(path)
+
     # Properties matching ReviewSession interface
 
     @property
@@ -555,22 +829,11 @@ class AcreSession:
 
     @property
     def created_at(self) -> datetime:
-        # Find earliest activity
-        for activity in self.review.activities:
-            if activity.created:
-                return datetime.fromisoformat(activity.created.replace("Z", "+00:00"))
-        return datetime.now()
+        return self._get_timestamps()[0] or datetime.now()
 
     @property
     def updated_at(self) -> datetime:
-        # Find latest activity
-        latest = None
-        for activity in self.review.activities:
-            if activity.created:
-                dt = datetime.fromisoformat(activity.created.replace("Z", "+00:00"))
-                if latest is None or dt > latest:
-                    latest = dt
-        return latest or datetime.now()
+        return self._get_timestamps()[1] or datetime.now()
 
     @property
     def notes(self) -> str:
@@ -578,11 +841,21 @@ class AcreSession:
 
     @property
     def files(self) -> dict[str, FileReviewState]:
-        """Get file states dict."""
-        return {
-            path: FileReviewState(file_path=path, _session=self)
-            for path in self._file_paths
-        }
+        """Get file states dict.
+
+        The same dict is returned until the file list changes, so it must
+        not be modified.
+        """
+        paths = self._file_paths
+        if (
+            self._files_view is None
+            or self._files_view_source is not paths
+            or self._files_view_len != len(paths)
+        ):
+            self._files_view = {path: self._file_state(path) for path in paths}
+            self._files_view_source = paths
+            self._files_view_len = len(paths)
+        return self._files_view
 
     @property
     def reviewed_count(self) -> int:
@@ -595,99 +868,96 @@ class AcreSession:
     @property
     def all_comments(self) -> list[CommentView]:
         """Get all visible comments."""
-        comments = []
-        visible = self.review.get_visible_activities()
-        for activity in visible:
-            if isinstance(activity, OCRComment):
-                comments.append(CommentView(_comment=activity))
-        return sorted(
-            comments,
-            key=lambda c: (c.file_path, c.line_no if c.line_no else 0)
-        )
+        return list(self._get_index().sorted_comments)
 
     @property
     def total_comments(self) -> int:
-        return len(self.all_comments)
+        return len(self._get_index().sorted_comments)
 
     def get_file_state(self, file_path: str) -> FileReviewState:
         """Get file review state."""
-        if file_path not in self._file_paths:
+        state = self.files.get(file_path)
+        if state is None:
             self._file_paths.append(file_path)
-        return FileReviewState(file_path=file_path, _session=self)
+            state = self._file_state(file_path)
+        return state
+
+    def _file_state(self, file_path: str) -> FileReviewState:
+        """Get the shared FileReviewState for a path, creating it once."""
+        state = self._file_states.get(file_path)
+        if state is None:
+            state = self._file_states[file_path] = FileReviewState(
+                file_path=file_path, _session=self
+            )
+        return state
 
     # Internal query methods
 
+    def _get_index(self) -> _ActivityIndex:
+        """Get the index of visible activities, rebuilding it if stale."""
+        activities = self.review.activities
+        if (
+            self._index is None
+            or self._index_source is not activities
+            or self._index_len != len(activities)
+        ):
+            self._index = _build_activity_index(self.review)
+            self._index_source = activities
+            self._index_len = len(activities)
+        return self._index
+
+    def _get_timestamps(self) -> tuple[datetime | None, datetime | None]:
+        """Get the first activity's timestamp and the latest one.
+
+        Worked out on first use for the current index, so it's redone
+        only when activities change.
+        """
+        index = self._get_index()
+        if index.timestamps is None:
+            first = latest = None
+            for activity in self.review.activities:
+                if activity.created:
+                    dt = _parse_timestamp(activity.created)
+                    if first is None:
+                        first = dt
+                    if latest is None or dt > latest:
+                        latest = dt
+            index.timestamps = (first, latest)
+        return index.timestamps
+
     def _is_file_reviewed(self, file_path: str) -> bool:
         """Check if file has an active reviewed mark."""
-        visible = self.review.get_visible_activities()
-        for activity in visible:
-            if isinstance(activity, ReviewMark) and activity.category == "reviewed":
-                if activity.location and activity.location.file == file_path:
-                    # File-level review mark (no lines)
-                    if not activity.location.lines:
-                        return True
-        return False
+        return file_path in self._get_index().reviewed_mark_ids
 
     def _get_file_reviewed_mark_id(self, file_path: str) -> str | None:
         """Get the ID of the file's reviewed mark, if any."""
-        visible = self.review.get_visible_activities()
-        for activity in visible:
-            if isinstance(activity, ReviewMark) and activity.category == "reviewed":
-                if activity.location and activity.location.file == file_path:
-                    if not activity.location.lines:
-                        return activity.id
-        return None
+        return self._get_index().reviewed_mark_ids.get(file_path)
 
     def _get_file_comments(self, file_path: str) -> list[CommentView]:
         """Get visible comments for a file."""
-        comments = []
-        visible = self.review.get_visible_activities()
-        for activity in visible:
-            if isinstance(activity, OCRComment):
-                if activity.location and activity.location.file == file_path:
-                    comments.append(CommentView(_comment=activity))
-        return comments
+        return list(self._get_index().comments_by_file.get(file_path, ()))
 
     def _get_file_resolved_hunks(self, file_path: str) -> list[dict]:
         """Get resolved hunks for a file as dicts."""
-        hunks = []
-        visible = self.review.get_visible_activities()
-        for activity in visible:
-            if isinstance(activity, ReviewMark) and activity.category == "reviewed":
-                if activity.location and activity.location.file == file_path:
-                    if activity.location.lines:
-                        # This is a hunk review, not file-level
-                        for start, end in activity.location.lines:
-                            hunks.append({
-                                "id": activity.id,
-                                "hunk_id": f"{file_path}::{start}-{end}",
-                                "file_path": file_path,
-                                "old_start": start,
-                                "old_count": end - start + 1,
-                                "new_start": start,
-                                "new_count": end - start + 1,
-                                "header": "",
-                                "lines_preview": "",
-                            })
-        return hunks
+        return list(self._get_index().hunks_by_file.get(file_path, ()))
 
     def _is_hunk_resolved(self, file_path: str, hunk_id: str) -> bool:
         """Check if a hunk is resolved."""
         # hunk_id format: "file_path::hash" or custom format
-        for hunk in self._get_file_resolved_hunks(file_path):
-            if hunk["hunk_id"] == hunk_id:
-                return True
-        return False
+        return (file_path, hunk_id) in self._get_index().hunk_mark_ids
 
     def _get_hunk_review_mark_id(self, file_path: str, hunk_id: str) -> str | None:
         """Get the ID of a hunk's review mark."""
-        for hunk in self._get_file_resolved_hunks(file_path):
-            if hunk["hunk_id"] == hunk_id:
-                return hunk["id"]
-        return None
+        return self._get_index().hunk_mark_ids.get((file_path, hunk_id))
 
     # Mutation methods (append activities)
 
+    def _human_author(self) -> Author:
+        """Get the Author for the current git user, creating it on first use."""
+        if self._cached_human_author is None:
+            self._cached_human_author = make_human_author()
+        return self._cached_human_author
+
     def add_comment(
         self,
         content: str,
@@ -707,7 +977,7 @@ class AcreSession:
         if is_agent:
             author = make_agent_author(agent_name, agent_model)
         else:
-            author = make_human_author()
+            author = self._human_author()
 
         # Create location
         location = None
@@ -743,7 +1013,7 @@ class AcreSession:
                 if is_agent:
                     author = make_agent_author(agent_name, agent_model)
                 else:
-                    author = make_human_author()
+                    author = self._human_author()
 
                 reply = OCRComment(
                     category="note",
@@ -760,7 +1030,7 @@ class AcreSession:
         resolution = Resolution(
             category="resolved",
             addresses=[comment_id],
-            author=make_human_author(),
+            author=self._human_author(),
         )
         self.review.activities.append(resolution)
 
@@ -793,7 +1063,7 @@ class AcreSession:
             retraction = Retraction(
                 category="retract",
                 addresses=[existing_id],
-                author=make_human_author(),
+                author=self._human_author(),
             )
             self.review.activities.append(retraction)
             return False
@@ -802,7 +1072,7 @@ class AcreSession:
             mark = ReviewMark(
                 category="reviewed",
                 location=Location(file=file_path),
-                author=make_human_author(),
+                author=self._human_author(),
             )
             self.review.activities.append(mark)
             return True
@@ -822,7 +1092,7 @@ class AcreSession:
         mark = ReviewMark(
             category="reviewed",
             location=Location(file=file_path, lines=[(new_start, new_start + new_count - 1)]),
-            author=make_human_author(),
+            author=self._human_author(),
             content=f"Hunk: {header}" if header else None,
         )
         self.review.activities.append(mark)
@@ -834,7 +1104,7 @@ class AcreSession:
             retraction = Retraction(
                 category="retract",
                 addresses=[mark_id],
-                author=make_human_author(),
+                author=self._human_author(),
             )
             self.review.activities.append(retraction)
             return True
@@ -845,6 +1115,10 @@ class AcreSession:
         pass
 
 
+# Characters of a source ref not kept in session file names
+_UNSAFE_NAME_CHARS_RE = re.compile(r"[^\w.-]")
+
+
 def get_session_path(
     repo_path: Path,
     diff_source_type: str,
@@ -857,6 +1131,7 @@ def get_session_path(
     - Default (uncommitted, staged, branch): .opencodereview.{ext}
     - commit (-c): .opencodereview.<commit>.{ext}
     - pr (--pr): .opencodereview.pr-<number>.{ext}
+    - commits (--commits): .opencodereview.commits-<range or list>.{ext}
     """
     ext = format
     base = ".opencodereview"
@@ -866,6 +1141,9 @@ def get_session_path(
         suffix = f".{ref}"
     elif diff_source_type == "pr" and diff_source_ref:
         suffix = f".pr-{diff_source_ref}"
+    elif diff_source_type == "commits" and diff_source_ref:
+        # Keep the name a single plain file name, e.g. for origin/main..HEAD
+        suffix = f".commits-{_UNSAFE_NAME_CHARS_RE.sub('_', diff_source_ref)}"
     else:
         suffix = ""
 
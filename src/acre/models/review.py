@@ -9,7 +9,7 @@ from uuid import uuid4
 from acre.models.comment import Comment
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedHunk:
     """A hunk that has been marked as resolved (hidden from diff view)."""
 
@@ -25,7 +25,7 @@ class ResolvedHunk:
     resolved_by: str = "human"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileReviewState:
     """Review state for a single file."""
 
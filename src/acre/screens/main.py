@@ -1,12 +1,15 @@
 """Main review screen."""
 
+import io
+from functools import partial
+
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
 from textual.screen import Screen
 from textual.widgets import Footer, Header, Static
 
-from acre.models.diff import DiffSet
+from acre.models.diff import DiffHunk, DiffSet, LineType
 from acre.models.ocr_adapter import AcreSession, CommentView
 from acre.widgets.comment_input import CommentCancelled, CommentDeleted, CommentInput, CommentSubmitted
 from acre.widgets.comment_panel import CommentPanel, CommentSelected
@@ -18,6 +21,14 @@ from acre.widgets.splitter import VerticalSplitter
 from acre.widgets.status_bar import StatusBar
 
 
+# Unified diff prefix for each line type, used when formatting hunk context
+_LINE_PREFIX = {
+    LineType.ADDITION: "+",
+    LineType.DELETION: "-",
+    LineType.CONTEXT: " ",
+}
+
+
 class MainScreen(Screen):
     """Primary review screen with diff view and file list."""
 
@@ -120,6 +131,9 @@ class MainScreen(Screen):
         self._show_llm_panel = False
         self._show_resolved_panel = False
         self._semantic_mode = semantic_mode
+        # Formatted hunk context keyed by id(hunk); the hunk is kept alongside
+        # so a recycled id can never return another hunk's text
+        self._hunk_context_cache: dict[int, tuple[DiffHunk, str]] = {}
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -263,7 +277,6 @@ class MainScreen(Screen):
             is_deleted = False
 
             if current_line:
-                from acre.models.diff import LineType
                 is_deleted = current_line.line_type == LineType.DELETION
 
             self._open_comment_input(current_file.path, line_no, is_deleted_line=is_deleted)
@@ -310,8 +323,8 @@ class MainScreen(Screen):
 
         self.notify(f"Resolved {comment.category.upper()} comment")
 
-    def _get_hunk_context(self, line_no: int | None = None) -> str | None:
-        """Get the hunk content for context when commenting."""
+    def _find_hunk(self, line_no: int | None = None) -> DiffHunk | None:
+        """Find the hunk of the current file to use as context when commenting."""
         current_file = self.diff_view.current_file
         if not current_file:
             return None
@@ -331,20 +344,42 @@ class MainScreen(Screen):
             if current_file.hunks:
                 current_hunk = current_file.hunks[0]
 
-        if not current_hunk:
-            return None
-
-        # Format hunk content
-        from acre.models.diff import LineType
-        lines = [f"@@ {current_hunk.header} @@"]
-        for line in current_hunk.lines:
-            prefix = {
-                LineType.ADDITION: "+",
-                LineType.DELETION: "-",
-                LineType.CONTEXT: " ",
-            }.get(line.line_type, " ")
-            lines.append(f"{prefix}{line.content}".rstrip())
-        return "\n".join(lines)
+        return current_hunk
+
+    def _get_hunk_context(self, hunk: DiffHunk) -> str:
+        """Get a hunk's content for context when commenting."""
+        cached = self._hunk_context_cache.get(id(hunk))
+        if cached is not None and cached[0] is hunk:
+            return cached[1]
+
+        context = self._format_hunk_context(hunk)
+        self._hunk_context_cache[id(hunk)] = (hunk, context)
+        return context
+
+    def _format_hunk_context(self, hunk: DiffHunk) -> str:
+        """Format a hunk's content as unified diff text."""
+        buf = io.StringIO()
+        write = buf.write
+        write(f"@@ {hunk.header} @@")
+        for line in hunk.lines:
+            prefix = _LINE_PREFIX.get(line.line_type, " ")
+            content = line.content
+            # Only strip lines that actually end in whitespace
+            if content and content[-1].isspace():
+                content = content.rstrip()
+            write("\n")
+            if content:
+                write(prefix)
+                write(content)
+            else:
+                write(prefix.rstrip())
+        return buf.getvalue()
+
+    def prune_hunk_context_cache(self) -> None:
+        """Drop cached hunk context for hunks that left the current diff."""
+        live = {id(hunk) for file in self.diff_view.diff_set.files for hunk in file.hunks}
+        for key in self._hunk_context_cache.keys() - live:
+            del self._hunk_context_cache[key]
 
     def _open_comment_input(
         self,
@@ -359,10 +394,14 @@ class MainScreen(Screen):
         for widget in self.query("CommentInput"):
             widget.remove()
 
-        # Get hunk context for new comments (not edits)
+        # Hunk context for new comments (not edits), built only if it is used.
+        # The hunk is picked now, so a later file switch or diff reload can't
+        # change which one the comment is sent with.
         context = None
         if edit_comment is None:
-            context = self._get_hunk_context(line_no)
+            hunk = self._find_hunk(line_no)
+            if hunk is not None:
+                context = partial(self._get_hunk_context, hunk)
 
         # Create and mount the comment input
         comment_input = CommentInput(
@@ -599,13 +638,10 @@ class MainScreen(Screen):
         status_bar.refresh_status()
 
     def _auto_save(self) -> None:
-        """Auto-save the session."""
-        try:
-            from acre.app import AcreApp
-            if isinstance(self.app, AcreApp):
-                self.app.save_session()
-        except Exception as e:
-            self.notify(f"Auto-save failed: {e}", severity="warning")
+        """Auto-save the session (debounced by the app)."""
+        from acre.app import AcreApp
+        if isinstance(self.app, AcreApp):
+            self.app.schedule_save()
 
     def on_comment_selected(self, event: CommentSelected) -> None:
         """Handle comment selection from comment panel."""
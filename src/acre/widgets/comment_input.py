@@ -1,5 +1,6 @@
 """Comment input widget for adding and editing review comments."""
 
+from collections.abc import Callable
 from enum import Enum
 
 from textual.app import ComposeResult
@@ -138,7 +139,7 @@ class CommentInput(Widget):
         line_no_end: int | None = None,
         is_deleted_line: bool = False,
         edit_comment: CommentView | None = None,
-        context: str | None = None,
+        context: str | Callable[[], str | None] | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -147,7 +148,15 @@ class CommentInput(Widget):
         self.line_no_end = line_no_end
         self.is_deleted_line = is_deleted_line
         self.edit_comment = edit_comment  # If set, we're editing an existing comment
-        self.context = context  # Hunk content for LLM context
+        # Hunk content for LLM context; a callable is only evaluated on first use
+        self._hunk_context = context
+
+    @property
+    def context(self) -> str | None:
+        """Hunk content for LLM context, built on first access."""
+        if callable(self._hunk_context):
+            self._hunk_context = self._hunk_context()
+        return self._hunk_context
 
     def compose(self) -> ComposeResult:
         # Header with location
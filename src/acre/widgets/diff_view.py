@@ -13,6 +13,23 @@ from acre.models.diff import DiffFile, DiffHunk, DiffLine, DiffSet, LineType
 from acre.models.ocr_adapter import AcreSession, CommentView
 
 
+# Diff prefix and color for each line type
+_LINE_STYLE = {
+    LineType.ADDITION: ("+", "green"),
+    LineType.DELETION: ("-", "red"),
+    LineType.CONTEXT: (" ", ""),
+    LineType.HEADER: (" ", "dim"),
+}
+
+# Comment bar color by category (CommentView.category is a string)
+_COMMENT_BAR_COLORS = {
+    "note": "blue",
+    "suggestion": "cyan",
+    "issue": "red",
+    "praise": "green",
+}
+
+
 class CommentAction(Message):
     """Message for comment actions (edit/delete)."""
 
@@ -355,19 +372,7 @@ class DiffView(VerticalScroll):
 
     def _format_diff_line(self, diff_line: DiffLine, file_path: str, is_selected: bool = False, is_cursor: bool = False) -> str:
         """Format a single diff line with colors, selection, and comment markers."""
-        prefix = {
-            LineType.ADDITION: "+",
-            LineType.DELETION: "-",
-            LineType.CONTEXT: " ",
-            LineType.HEADER: " ",
-        }[diff_line.line_type]
-
-        color = {
-            LineType.ADDITION: "green",
-            LineType.DELETION: "red",
-            LineType.CONTEXT: "",
-            LineType.HEADER: "dim",
-        }[diff_line.line_type]
+        prefix, color = _LINE_STYLE[diff_line.line_type]
 
         # Line number
         line_no = diff_line.line_no
@@ -380,14 +385,7 @@ class DiffView(VerticalScroll):
             for comment in file_state.comments:
                 if comment.covers_line(line_no):
                     # Color based on comment category
-                    bar_colors = {
-                        "note": "blue",
-                        "suggestion": "cyan",
-                        "issue": "red",
-                        "praise": "green",
-                    }
-                    # CommentView.category returns string, not enum
-                    bar_color = bar_colors.get(comment.category, "yellow")
+                    bar_color = _COMMENT_BAR_COLORS.get(comment.category, "yellow")
                     comment_bar = f"[{bar_color}]┃[/{bar_color}]"
                     break
 
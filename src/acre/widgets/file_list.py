@@ -1,5 +1,7 @@
 """File list sidebar widget."""
 
+from collections.abc import Iterable
+
 from textual.binding import Binding
 from textual.message import Message
 from textual.widgets import Tree
@@ -49,6 +51,7 @@ class FileList(Tree):
         self.diff_set = diff_set
         self.session = session
         self._file_nodes: dict[str, TreeNode] = {}
+        self._dir_nodes: dict[str, TreeNode] = {}
 
     def on_mount(self) -> None:
         """Build the file tree on mount."""
@@ -65,10 +68,16 @@ class FileList(Tree):
             app/
                 models/
                     file.py
+
+        Directories the user collapsed stay collapsed across rebuilds; new
+        directories start expanded.
         """
+        collapsed_dirs = {
+            dir_path for dir_path, node in self._dir_nodes.items() if not node.is_expanded
+        }
         self.root.remove_children()
         self._file_nodes.clear()
-        self._dir_nodes: dict[str, TreeNode] = {}
+        self._dir_nodes.clear()
 
         # Sort files by path for consistent ordering
         sorted_files = sorted(self.diff_set.files, key=lambda f: f.path)
@@ -121,7 +130,11 @@ class FileList(Tree):
                 collapsed_path = "/".join(parts[:i + 1])
 
                 if collapsed_path not in self._dir_nodes:
-                    dir_node = current_node.add(collapsed_name, data={"dir": collapsed_path})
+                    dir_node = current_node.add(
+                        collapsed_name,
+                        data={"dir": collapsed_path},
+                        expand=collapsed_path not in collapsed_dirs,
+                    )
                     self._dir_nodes[collapsed_path] = dir_node
                     current_node = dir_node
                 else:
@@ -193,6 +206,18 @@ class FileList(Tree):
                     node.set_label(self._format_file_label(file, filename))
                     break
 
+    def refresh_files(self, file_paths: Iterable[str]) -> None:
+        """Refresh the display for several files, skipping unchanged labels."""
+        files_by_path = {file.path: file for file in self.diff_set.files}
+        for file_path in file_paths:
+            node = self._file_nodes.get(file_path)
+            file = files_by_path.get(file_path)
+            if node is None or file is None:
+                continue
+            label = self._format_file_label(file, file_path.split("/")[-1])
+            if label != node.label:
+                node.set_label(label)
+
     def select_file(self, file_path: str) -> None:
         """Select a file in the tree."""
         if file_path in self._file_nodes:
@@ -1,5 +1,7 @@
 """LLM sidebar widget for displaying Claude responses."""
 
+from typing import Iterable
+
 from rich.markup import escape as rich_escape
 from rich.text import Text
 from textual.app import ComposeResult
@@ -9,7 +11,7 @@ from textual.widget import Widget
 from textual.widgets import Input, Static, LoadingIndicator
 from textual.worker import Worker, get_current_worker
 
-from acre.core.llm import ClaudeCLIBackend, build_analysis_context, get_analysis_prompts
+from acre.core.llm import ClaudeCLIBackend, get_analysis_prompts, iter_analysis_context
 from acre.models.diff import DiffFile, DiffHunk
 
 
@@ -104,6 +106,11 @@ class LLMSidebar(VerticalScroll):
         except RuntimeError as e:
             self.query_one("#llm-status", Static).update(f"[red]{e}[/red]")
 
+    def on_unmount(self) -> None:
+        """Stop the backend's claude process along with the sidebar."""
+        if self._backend:
+            self._backend.close()
+
     def analyze_file(self, file: DiffFile, hunk: DiffHunk | None = None) -> None:
         """Start analysis of a file or hunk."""
         if not self._backend:
@@ -117,15 +124,21 @@ class LLMSidebar(VerticalScroll):
         self._current_file = file
         self._current_hunk = hunk
         self._messages.clear()
+        self._backend.new_conversation()
 
         # Build context and prompt
-        context = build_analysis_context(file, hunk)
+        context = iter_analysis_context(file, hunk)
         prompts = get_analysis_prompts()
         prompt = prompts["review"]
 
         self._run_analysis(prompt, context)
 
-    def _run_analysis(self, prompt: str, context: str | None = None) -> None:
+    def _run_analysis(
+        self,
+        prompt: str,
+        context: str | Iterable[str] | None = None,
+        followup: bool = False,
+    ) -> None:
         """Run analysis in a background worker thread."""
         self._is_loading = True
         self._streaming_content = ""
@@ -144,18 +157,24 @@ class LLMSidebar(VerticalScroll):
 
         # Run in worker thread
         self._current_worker = self.run_worker(
-            self._stream_analysis(prompt, context),
+            self._stream_analysis(prompt, context, followup),
             name="llm_analysis",
             thread=True,
         )
 
-    async def _stream_analysis(self, prompt: str, context: str | None) -> str:
+    async def _stream_analysis(
+        self,
+        prompt: str,
+        context: str | Iterable[str] | None,
+        followup: bool,
+    ) -> str:
         """Stream analysis from Claude in a worker thread."""
         worker = get_current_worker()
 
         try:
             # Use streaming mode
-            for chunk in self._backend.analyze(prompt, context, stream=True):
+            chunks = self._backend.analyze(prompt, context, stream=True, followup=followup)
+            for chunk in chunks:
                 if worker.is_cancelled:
                     break
                 self._streaming_content += chunk
@@ -256,12 +275,13 @@ class LLMSidebar(VerticalScroll):
         question = event.value.strip()
         event.input.value = ""
 
-        # Build context from current file if we have one
+        # Context from the current file, for when the conversation has to
+        # start over; an ongoing one already has it from its first prompt
         context = None
         if self._current_file:
-            context = build_analysis_context(self._current_file, self._current_hunk)
+            context = iter_analysis_context(self._current_file, self._current_hunk)
 
-        self._run_analysis(question, context)
+        self._run_analysis(question, context, followup=True)
 
     def clear(self) -> None:
         """Clear the conversation."""
@@ -273,5 +293,7 @@ class LLMSidebar(VerticalScroll):
         self._current_file = None
         self._current_hunk = None
         self._streaming_content = ""
+        if self._backend:
+            self._backend.new_conversation()
         self.query_one("#llm-response", Static).update("")
         self.query_one("#llm-status", Static).update("Cleared - press 'a' to analyze")